@@ -2,6 +2,7 @@
 寻找方块动作实现
 """
 import math
+import numpy as np
 from utils.logger import get_logger
 from agent.environment.environment import global_environment
 from mcp_server.client import global_mcp_client
@@ -78,27 +79,24 @@ async def find_block_action(block_type: str, radius: float = 16.0) -> tuple[bool
                 #     continue
                     
                 positions = block_data.get("positions", [])
-                for pos in positions:
-                    x = pos.get("x", 0)
-                    y = pos.get("y", 0)
-                    z = pos.get("z", 0)
-                    
-                    # 计算与玩家的距离
-                    dx = x - player_pos.x
-                    dy = y - player_pos.y
-                    dz = z - player_pos.z
-                    distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+                if not positions:
+                    continue
+                
+                # 一次性计算所有候选位置与玩家的距离
+                coords = [(pos.get("x", 0), pos.get("y", 0), pos.get("z", 0)) for pos in positions]
+                distances_sq = BlockPosition.distances_sq_to(player_pos.xyz, coords)
+                
+                # 只处理半径内的方块（以距离平方比较，只对命中的方块开方）
+                for index in np.flatnonzero(distances_sq <= radius * radius).tolist():
+                    x, y, z = coords[index]
+                    # 添加到方块缓存中
+                    block_pos = BlockPosition.get(x, y, z)
+                    global_block_cache.add_block(block_type, True, block_pos)
                     
-                    # 检查是否在半径内
-                    if distance <= radius:
-                        # 添加到方块缓存中
-                        block_pos = BlockPosition(x=x, y=y, z=z)
-                        global_block_cache.add_block(block_type, True, block_pos)
-                        
-                        found_blocks.append({
-                            'position': (x, y, z),
-                            'distance': distance
-                        })
+                    found_blocks.append({
+                        'position': (x, y, z),
+                        'distance': math.sqrt(distances_sq[index])
+                    })
         
         # 按距离排序
         found_blocks.sort(key=lambda x: x['distance'])
@@ -219,7 +219,7 @@ async def _check_and_mine_nearby_ores(current_pos):
         try:
             env_pos = global_environment.position
             if env_pos and hasattr(env_pos, 'x'):
-                current_pos = BlockPosition(env_pos)
+                current_pos = BlockPosition.from_position(env_pos)
             else:
                 return "无法获取有效的玩家位置来检查矿石"
         except Exception as e:
@@ -6,14 +6,18 @@
 import json
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set, Any
+from typing import Callable, Dict, List, Optional, Tuple, Set, Any
 from datetime import datetime
 from collections import defaultdict
+import numpy as np
 from utils.logger import get_logger
 from agent.common.basic_class import BlockPosition, Position, CachedBlock, PlayerPositionCache
 
 logger = get_logger("BlockCache")
 
+# 方块结构数组的最小容量，也是触发失效行压缩的最小失效行数
+BLOCK_ARRAY_MIN_CAPACITY = 1024
+
 
 class BlockCache:
     """方块缓存管理器"""
@@ -34,6 +38,12 @@ class BlockCache:
         # 名称索引：方块名称 -> 位置集合
         self._name_index: Dict[str, Set[BlockPosition]] = defaultdict(set)
         
+        # 方块坐标与类型编号的结构数组（SoA），与主缓存同步并保持插入顺序，用于向量化范围查询
+        self._reset_block_arrays()
+        
+        # 方块变化监听器：方块新增、类型改变或移除时以 (x, y, z) 调用，缓存整体清空时以 None 调用
+        self._block_change_listeners: List[Callable[[Optional[Tuple[int, int, int]]], None]] = []
+        
         # 玩家位置缓存 - 使用字典存储每个玩家的最新位置，键为玩家名称
         self._player_position_cache: Dict[str, PlayerPositionCache] = {}
         
@@ -109,7 +119,7 @@ class BlockCache:
                     try:
                         # 解析位置键 "x,y,z"
                         x, y, z = map(int, pos_key.split(','))
-                        position = BlockPosition({"x": x, "y": y, "z": z})
+                        position = BlockPosition.get(x, y, z)
                         
                         # 创建缓存方块对象
                         cached_block = CachedBlock.from_dict(block_data)
@@ -117,6 +127,7 @@ class BlockCache:
                         # 添加到缓存
                         self._position_cache[position] = cached_block
                         self._type_index[cached_block.block_type].add(position)
+                        self._array_put(position, cached_block)
                         
                         loaded_count += 1
                     except Exception as e:
@@ -355,7 +366,9 @@ class BlockCache:
         self._position_cache.clear()
         self._type_index.clear()
         self._name_index.clear()
+        self._reset_block_arrays()
         self._player_position_cache.clear()
+        self._notify_block_changed(None)
         
         # 重置统计信息
         self._stats = {
@@ -486,7 +499,7 @@ class BlockCache:
     #                     x, y, z = int(pos[0]), int(pos[1]), int(pos[2])
                     
     #                 pos_dict = {"x": x, "y": y, "z": z}
-    #                 self.add_block(block_type, BlockPosition(pos_dict))
+    #                 self.add_block(block_type, BlockPosition.from_dict(pos_dict))
     #                 updated_count += 1
 
     #         return updated_count
@@ -515,6 +528,7 @@ class BlockCache:
         if position in self._position_cache:
             # 更新现有方块
             existing_block = self._position_cache[position]
+            type_changed = existing_block.block_type != block_type
             existing_block.block_type = block_type
             existing_block.can_see = can_see
             
@@ -524,9 +538,12 @@ class BlockCache:
                 
             # 更新索引
             self._update_indices(existing_block, block_type)
+            self._array_put(position, existing_block)
             
             self._stats["total_updates"] += 1
             
+            if type_changed:
+                self._notify_block_changed(position.xyz)
             return existing_block
         else:
             # 添加新方块
@@ -540,10 +557,12 @@ class BlockCache:
             
             self._position_cache[position] = new_block
             self._type_index[block_type].add(position)
+            self._array_put(position, new_block)
             
             self._stats["total_blocks_cached"] += 1
             self._stats["total_updates"] += 1
             
+            self._notify_block_changed(position.xyz)
             return new_block
     
     def get_block(self, x: int, y: int, z: int) -> Optional[CachedBlock]:
@@ -556,7 +575,7 @@ class BlockCache:
         Returns:
             方块信息，如果不存在则返回None
         """
-        position = BlockPosition({"x": x, "y": y, "z": z})
+        position = BlockPosition.from_xyz(x, y, z)
         
         if position in self._position_cache:
             self._stats["cache_hits"] += 1
@@ -565,6 +584,31 @@ class BlockCache:
             self._stats["cache_misses"] += 1
             return None
     
+    def get_blocks(self, positions: List[Tuple[int, int, int]]) -> Dict[Tuple[int, int, int], Optional[CachedBlock]]:
+        """
+        批量获取多个位置的方块信息
+        
+        Args:
+            positions: 坐标元组 (x, y, z) 列表
+            
+        Returns:
+            坐标元组 -> 方块信息的字典，未缓存的位置对应None
+        """
+        position_cache = self._position_cache
+        from_xyz = BlockPosition.from_xyz
+        result = {}
+        hits = 0
+        
+        for x, y, z in positions:
+            block = position_cache.get(from_xyz(x, y, z))
+            if block is not None:
+                hits += 1
+            result[(x, y, z)] = block
+        
+        self._stats["cache_hits"] += hits
+        self._stats["cache_misses"] += len(positions) - hits
+        return result
+    
     def get_blocks_by_type(self, block_type: str) -> List[CachedBlock]:
         """
         获取指定类型的所有方块
@@ -584,22 +628,20 @@ class BlockCache:
         """
         获取指定范围内的所有方块
         """
-        radius_squared = radius * radius
-        blocks_in_range = []
-        for block in self._position_cache.values():
-            if block.block_type != block_type:
-                continue
-            dx = block.position.x - center_x
-            dy = block.position.y - center_y
-            dz = block.position.z - center_z
-            distance_squared = dx*dx + dy*dy + dz*dz
-            if distance_squared <= radius_squared:
-                blocks_in_range.append(block)
-        # 按与中心点的距离从小到大排序
-        blocks_in_range.sort(key=lambda b: (b.position.x - center_x) * (b.position.x - center_x) +
-                                           (b.position.y - center_y) * (b.position.y - center_y) +
-                                           (b.position.z - center_z) * (b.position.z - center_z))
-        return blocks_in_range
+        type_id = self._type_ids.get(block_type)
+        if type_id is None:
+            return []
+        count = len(self._array_blocks)
+        rows = np.flatnonzero(self._type_id_array[:count] == type_id)
+        if not rows.size:
+            return []
+        # 一次性计算所有候选方块到中心点的距离平方，与半径平方比较，无需开方
+        distance_squared = BlockPosition.distances_sq_to((center_x, center_y, center_z), self._position_array[rows])
+        in_range = np.flatnonzero(distance_squared <= radius * radius)
+        # 按与中心点的距离从小到大排序（稳定排序，距离相同时保持原有顺序）
+        order = in_range[np.argsort(distance_squared[in_range], kind="stable")]
+        blocks = self._array_blocks
+        return [blocks[i] for i in rows[order].tolist()]
     
     
     def get_blocks_in_range(self, center_x: float, center_y: float, center_z: float, 
@@ -614,19 +656,13 @@ class BlockCache:
         Returns:
             范围内的方块列表
         """
-        radius_squared = radius * radius
-        blocks_in_range = []
-        
-        for block in self._position_cache.values():
-            dx = block.position.x - center_x
-            dy = block.position.y - center_y
-            dz = block.position.z - center_z
-            distance_squared = dx*dx + dy*dy + dz*dz
-            
-            if distance_squared <= radius_squared:
-                blocks_in_range.append(block)
-        
-        return blocks_in_range
+        count = len(self._array_blocks)
+        if not count:
+            return []
+        distance_squared = BlockPosition.distances_sq_to((center_x, center_y, center_z), self._position_array[:count])
+        rows = np.flatnonzero((distance_squared <= radius * radius) & (self._type_id_array[:count] >= 0))
+        blocks = self._array_blocks
+        return [blocks[i] for i in rows.tolist()]
     
     def remove_block(self, x: float, y: float, z: float) -> bool:
         """
@@ -638,7 +674,7 @@ class BlockCache:
         Returns:
             是否成功移除
         """
-        position = BlockPosition({"x": x, "y": y, "z": z})
+        position = BlockPosition.from_dict({"x": x, "y": y, "z": z})
         
         if position not in self._position_cache:
             return False
@@ -647,6 +683,7 @@ class BlockCache:
         
         # 从主缓存移除
         del self._position_cache[position]
+        self._array_remove(position)
         
         # 从索引中移除
         self._type_index[block.block_type].discard(position)
@@ -656,9 +693,78 @@ class BlockCache:
             del self._type_index[block.block_type]
         
         logger.debug(f"移除方块缓存: {block.block_type} at ({x}, {y}, {z})")
+        self._notify_block_changed(position.xyz)
         return True
     
     
+    def add_block_change_listener(self, callback: Callable[[Optional[Tuple[int, int, int]]], None]) -> None:
+        """注册方块变化监听器（方块新增、类型改变、移除或缓存清空时调用）"""
+        self._block_change_listeners.append(callback)
+    
+    def _notify_block_changed(self, position_key: Optional[Tuple[int, int, int]]) -> None:
+        """通知方块变化监听器，单个监听器出错不影响其他监听器和缓存更新"""
+        for callback in self._block_change_listeners:
+            try:
+                callback(position_key)
+            except Exception:
+                logger.opt(exception=True).warning("方块变化监听器执行失败")
+    
+    def _reset_block_arrays(self) -> None:
+        """重置方块结构数组（移除时只把行标记为失效，失效行过多时再整体压缩）"""
+        self._position_array = np.empty((BLOCK_ARRAY_MIN_CAPACITY, 3), dtype=np.int64)
+        self._type_id_array = np.empty(BLOCK_ARRAY_MIN_CAPACITY, dtype=np.int32)
+        self._array_blocks: List[Optional[CachedBlock]] = []
+        self._array_index: Dict[BlockPosition, int] = {}
+        # 方块类型 -> 类型编号
+        self._type_ids: Dict[str, int] = {}
+        self._dead_rows = 0
+    
+    def _array_put(self, position: BlockPosition, block: CachedBlock) -> None:
+        """写入或更新方块在结构数组中的行"""
+        type_id = self._type_ids.get(block.block_type)
+        if type_id is None:
+            type_id = self._type_ids[block.block_type] = len(self._type_ids)
+        index = self._array_index.get(position)
+        if index is not None:
+            self._type_id_array[index] = type_id
+            self._array_blocks[index] = block
+            return
+        count = len(self._array_blocks)
+        if count == len(self._type_id_array):
+            self._position_array = np.resize(self._position_array, (count * 2, 3))
+            self._type_id_array = np.resize(self._type_id_array, count * 2)
+        self._position_array[count] = position.xyz
+        self._type_id_array[count] = type_id
+        self._array_blocks.append(block)
+        self._array_index[position] = count
+    
+    def _array_remove(self, position: BlockPosition) -> None:
+        """将方块所在行标记为失效（类型编号 -1）"""
+        index = self._array_index.pop(position, None)
+        if index is None:
+            return
+        self._type_id_array[index] = -1
+        self._array_blocks[index] = None
+        self._dead_rows += 1
+        if self._dead_rows > BLOCK_ARRAY_MIN_CAPACITY and self._dead_rows * 2 > len(self._array_blocks):
+            self._compact_block_arrays()
+    
+    def _compact_block_arrays(self) -> None:
+        """丢弃失效行，保持其余行的相对顺序"""
+        count = len(self._array_blocks)
+        alive = np.flatnonzero(self._type_id_array[:count] >= 0)
+        alive_count = len(alive)
+        capacity = max(BLOCK_ARRAY_MIN_CAPACITY, alive_count * 2)
+        position_array = np.empty((capacity, 3), dtype=np.int64)
+        position_array[:alive_count] = self._position_array[alive]
+        type_id_array = np.empty(capacity, dtype=np.int32)
+        type_id_array[:alive_count] = self._type_id_array[alive]
+        self._position_array = position_array
+        self._type_id_array = type_id_array
+        self._array_blocks = [self._array_blocks[i] for i in alive.tolist()]
+        self._array_index = {block.position: i for i, block in enumerate(self._array_blocks)}
+        self._dead_rows = 0
+    
     def get_cache_stats(self) -> dict:
         """获取缓存统计信息"""
         return {
@@ -29,22 +29,23 @@ class NearbyBlockManager:
         # 分组：key 为展示名称（空气 -> 无方块，其它直接用方块类型）
         grouped_positions = {}
         block_num = 0
+        # 以距离平方比较，省去逐个方块开方
+        full_distance_sq = full_distance * full_distance
+        can_see_distance_sq = can_see_distance * can_see_distance
         
         for block in all_blocks:
             # 跳过空气方块，不加入显示
             if block.block_type == "air" or block.block_type == "cave_air":
                 continue
             
-            # 计算方块到中心的距离
-            distance_to_center = ((block.position.x - position.x) ** 2 + 
-                                 (block.position.y - position.y) ** 2 + 
-                                 (block.position.z - position.z) ** 2) ** 0.5
+            # 计算方块到中心的距离平方
+            distance_sq_to_center = block.position.distance_sq(position)
             
             # 根据距离范围决定显示规则
-            if distance_to_center <= full_distance:
+            if distance_sq_to_center <= full_distance_sq:
                 # 完全显示距离内显示所有方块
                 pass
-            elif distance_to_center <= can_see_distance:
+            elif distance_sq_to_center <= can_see_distance_sq:
                 # 可见显示距离内只显示可见方块
                 if not block.can_see:
                     continue
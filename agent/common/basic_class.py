@@ -22,13 +22,37 @@ Entity使用示例:
     # 转换为字典格式
     entity_dict = entity.to_dict()
 """
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
 import math
+import sys
+import weakref
 from datetime import datetime
+import numpy as np
 
 
-@dataclass
+# 取整函数的模块级别名，BlockPosition 构造时省去属性查找
+_floor = math.floor
+# 不可变坐标类在构造和缓存哈希值时使用的底层属性设置
+_setattr = object.__setattr__
+
+
+def _intern(value):
+    """驻留名称类字符串：玩家名、实体名等会被反复比较和作为字典键使用"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=1024)
+def _entity_coord_str(position: "Position") -> str:
+    """
+    实体坐标的显示文本（保留一位小数）
+    实体位置是共享的 Position 实例，静止的实体每次更新都会得到同一位置，坐标文本只格式化一次
+    """
+    return f"({position.x:.1f}, {position.y:.1f}, {position.z:.1f})"
+
+
+@dataclass(slots=True)
 class Player:
     """玩家信息"""
     uuid: str
@@ -51,27 +75,48 @@ class Player:
 
         return cls(
             uuid=data.get('uuid', ''),
-            username=data.get('username', ''),
-            display_name=data.get('display_name', data.get('username', '')),
+            username=_intern(data.get('username', '')),
+            display_name=_intern(data.get('display_name', data.get('username', ''))),
             ping=data.get('ping', 0),
             gamemode=data.get('gamemode', 0),
             entity=entity
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
-    """位置信息"""
+    """位置信息（创建后不可修改）"""
     x: float
     y: float
     z: float
     
+    # 哈希值缓存：坐标创建后不再修改，首次哈希时计算（不参与构造、比较和repr）
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
     def __hash__(self):
-        return hash((self.x, self.y, self.z))
+        h = self._hash
+        if h is None:
+            h = hash((self.x, self.y, self.z))
+            _setattr(self, "_hash", h)
+        return h
     
     def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Position):
+            return NotImplemented
         return self.x == other.x and self.y == other.y and self.z == other.z
     
+    @property
+    def xyz(self) -> Tuple[float, float, float]:
+        """(x, y, z) 坐标元组"""
+        return (self.x, self.y, self.z)
+    
+    @staticmethod
+    def stack(positions) -> np.ndarray:
+        """将一组带 x, y, z 属性的位置对象转换为 (N, 3) 浮点坐标数组，供批量距离计算使用"""
+        return np.array([p.xyz for p in positions], dtype=np.float64).reshape(-1, 3)
+    
     def __sub__(self, other):
         """位置减法操作"""
         if not isinstance(other, Position):
@@ -112,6 +157,13 @@ class Position:
         else:
             raise TypeError("other 必须是包含 x, y, z 属性的位置对象")
 
+    def distance_sq(self, other) -> float:
+        """计算与另一个位置的距离平方（只做距离比较或排序时使用，省去开方）"""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        dz = self.z - other.z
+        return dx*dx + dy*dy + dz*dz
+
     def to_dict(self) -> dict:
         return {
             "x": self.x,
@@ -123,39 +175,129 @@ class Position:
         return f"({self.x:.0f}, {self.y:.0f}, {self.z:.0f})"
 
 class BlockPosition:
-    """方块位置信息（整数坐标，通常用于方块格定位）"""
+    """方块位置信息（整数坐标，通常用于方块格定位），创建后不可修改"""
     x: int
     y: int
     z: int
+    
+    # 固定属性，使用 __slots__ 省去实例字典（方块缓存中数量巨大）
+    # _hash 为哈希值缓存：方块坐标创建后不再修改，作为字典键反复查找时无需重复构造元组
+    # _str 为字符串形式缓存：同一位置在日志和提示词中反复出现，只格式化一次
+    # __weakref__ 供共享实例池使用
+    __slots__ = ("x", "y", "z", "_hash", "_str", "__weakref__")
+    
+    # 共享实例池：(x, y, z) -> 实例，无人引用时自动回收
+    _pool: "weakref.WeakValueDictionary[Tuple[int, int, int], BlockPosition]" = weakref.WeakValueDictionary()
 
-    def __init__(self, pos: Position|dict|tuple|list = None, x: int = None, y: int = None, z: int = None):
-        if pos is not None:
-            if isinstance(pos, dict):
-                self.x = pos["x"]
-                self.y = pos["y"]
-                self.z = pos["z"]
-            elif isinstance(pos, (tuple, list)) and len(pos) == 3:
-                self.x = int(pos[0])
-                self.y = int(pos[1])
-                self.z = int(pos[2])
-            else:
-                # 假设是 Position 对象
-                self.x = math.floor(pos.x)
-                self.y = math.floor(pos.y)
-                self.z = math.floor(pos.z)
-        elif x is not None and y is not None and z is not None:
-            self.x = math.floor(x)
-            self.y = math.floor(y)
-            self.z = math.floor(z)
-        else:
-            raise ValueError("必须提供位置参数或 x, y, z 坐标")
+    def __init__(self, x: int, y: int, z: int):
+        # 只接受坐标（向下取整，负坐标的小数也能落到正确的方块格）；
+        # 字典、元组、Position 等其他形式请使用对应的 from_* 构造方法
+        _setattr(self, "x", _floor(x))
+        _setattr(self, "y", _floor(y))
+        _setattr(self, "z", _floor(z))
+        _setattr(self, "_hash", None)
+        _setattr(self, "_str", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BlockPosition 创建后不可修改")
+
+    def __delattr__(self, name):
+        raise AttributeError("BlockPosition 创建后不可修改")
+
+    def __copy__(self) -> 'BlockPosition':
+        # 不可变对象，复制时直接返回自身
+        return self
+
+    def __deepcopy__(self, memo) -> 'BlockPosition':
+        return self
+
+    def __reduce__(self):
+        return (BlockPosition.from_dict, ({"x": self.x, "y": self.y, "z": self.z},))
+
+    # 其他参数形式使用下列专用构造方法
+    @classmethod
+    def from_xyz(cls, x, y, z) -> 'BlockPosition':
+        """由坐标构造（向下取整），等价于 BlockPosition(x, y, z)"""
+        self = object.__new__(cls)
+        _setattr(self, "x", _floor(x))
+        _setattr(self, "y", _floor(y))
+        _setattr(self, "z", _floor(z))
+        _setattr(self, "_hash", None)
+        _setattr(self, "_str", None)
+        return self
+
+    @classmethod
+    def from_position(cls, pos) -> 'BlockPosition':
+        """由 Position 等带 x, y, z 属性的对象构造（向下取整）"""
+        return cls.from_xyz(pos.x, pos.y, pos.z)
+
+    @classmethod
+    def from_tuple(cls, xyz) -> 'BlockPosition':
+        """由 (x, y, z) 元组或列表构造（向下取整）"""
+        x, y, z = xyz
+        return cls.from_xyz(x, y, z)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BlockPosition':
+        """由 {"x", "y", "z"} 字典构造（原样保留坐标值）"""
+        self = object.__new__(cls)
+        _setattr(self, "x", data["x"])
+        _setattr(self, "y", data["y"])
+        _setattr(self, "z", data["z"])
+        _setattr(self, "_hash", None)
+        _setattr(self, "_str", None)
+        return self
+
+    @classmethod
+    def get(cls, x, y, z) -> 'BlockPosition':
+        """
+        获取坐标（向下取整）对应的共享实例
+        同一方块位置被反复观察时复用同一对象，作为方块缓存的键时字典查找可走同一对象的快速路径
+        """
+        key = (_floor(x), _floor(y), _floor(z))
+        pool = cls._pool
+        position = pool.get(key)
+        if position is None:
+            position = pool[key] = cls.from_xyz(*key)
+        return position
+
+    @property
+    def xyz(self) -> Tuple[int, int, int]:
+        """(x, y, z) 坐标元组"""
+        return (self.x, self.y, self.z)
+
+    @staticmethod
+    def stack(positions) -> np.ndarray:
+        """将一组方块位置转换为 (N, 3) 整数坐标数组，供批量距离计算使用"""
+        return np.array([p.xyz for p in positions], dtype=np.int64).reshape(-1, 3)
+
+    @staticmethod
+    def distances_sq_to(origin_xyz, points_xyz) -> np.ndarray:
+        """批量计算 (N, 3) 坐标数组中各点到原点的距离平方（只做阈值比较时可省去开方）"""
+        diff = np.asarray(points_xyz) - np.asarray(origin_xyz)
+        return np.einsum('ij,ij->i', diff, diff)
+
+    @staticmethod
+    def distances_to(origin_xyz, points_xyz) -> np.ndarray:
+        """批量计算 (N, 3) 坐标数组中各点到原点的欧几里得距离"""
+        return np.sqrt(BlockPosition.distances_sq_to(origin_xyz, points_xyz))
 
     def __hash__(self):
-        return hash((self.x, self.y, self.z))
+        h = self._hash
+        if h is None:
+            # 按 Minecraft BlockPos 的方式把整数坐标打包为一个整数（x/z 各26位，y 12位），
+            # 无需构造元组；字典构造时坐标可能是浮点数，先取整（相等的坐标取整结果相同），
+            # 超出范围的坐标只会增加碰撞，不影响相等判断；
+            # 直接返回打包后的整数，由解释器自行折算为哈希值，省去一次 hash() 调用
+            h = ((int(self.x) & 0x3FFFFFF) << 38) | ((int(self.z) & 0x3FFFFFF) << 12) | (int(self.y) & 0xFFF)
+            _setattr(self, "_hash", h)
+        return h
     
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, BlockPosition):
-            return False
+            return NotImplemented
         return self.x == other.x and self.y == other.y and self.z == other.z
 
     def to_dict(self) -> dict:
@@ -166,7 +308,11 @@ class BlockPosition:
         }
         
     def __str__(self) -> str:
-        return f"({self.x}, {self.y}, {self.z})"
+        text = self._str
+        if text is None:
+            text = f"({self.x}, {self.y}, {self.z})"
+            _setattr(self, "_str", text)
+        return text
     
     def distanceTo(self, other) -> float:
         """计算与另一个位置的距离
@@ -185,8 +331,15 @@ class BlockPosition:
         else:
             raise TypeError("other 必须是包含 x, y, z 属性的位置对象")
 
+    def distance_sq(self, other) -> float:
+        """计算与另一个位置的距离平方（只做距离比较或排序时使用，省去开方）"""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        dz = self.z - other.z
+        return dx*dx + dy*dy + dz*dz
+
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     """方块信息"""
     type: int
@@ -203,8 +356,44 @@ MATERIAL_TAG = [
     (5,"diamond"),
     (6,"netherite")
 ]
+def _classify_item_name(name: str) -> Tuple[str, str, int]:
+    """判断物品名称对应的工具类型与材质，返回 (工具类型, 材质, 材质等级)"""
+    tool_type = ""
+    tool_material = ""
+    tool_material_level = 0
+    for tag in TOOL_TAG:
+        if tag in name:
+            tool_type = tag
+            break
+    for level, material in MATERIAL_TAG:
+        if material in name:
+            tool_material = material
+            tool_material_level = level
+            break
+    return tool_type, tool_material, tool_material_level
+
+
+# 物品名称 -> (工具类型, 材质, 材质等级) 查找表
+# 预先填入全部 材质_工具 组合，其他物品名称首次出现时再做子串匹配并记入表中（物品种类有限）
+_ITEM_INFO: dict = {
+    f"{material}_{tool}": _classify_item_name(f"{material}_{tool}")
+    for _, material in MATERIAL_TAG
+    for tool in TOOL_TAG
+}
+
+
+def _get_item_info(name: str) -> Tuple[str, str, int]:
+    info = _ITEM_INFO.get(name)
+    if info is None:
+        info = _ITEM_INFO[name] = _classify_item_name(name)
+    return info
+
+
 class Item:
     """物品信息"""
+    __slots__ = ("name", "count", "slot", "durability", "max_durability",
+                 "tool_type", "tool_material", "tool_material_level")
+    
     def __init__(self, name: str, count: int, slot: int = None, durability: int = 0, max_durability: int = 0):
         self.name = name
         self.count = count
@@ -212,26 +401,14 @@ class Item:
         self.durability = durability
         self.max_durability = max_durability
         
-        #对工具的判断
-        self.tool_type:str = ""
-        self.tool_material:str = ""
-        self.tool_material_level:int = 0
-        
-        for tag in TOOL_TAG:
-            if tag in self.name:
-                self.tool_type = tag
-                break   
-        for tag in MATERIAL_TAG:    
-            if tag[1] in self.name:
-                self.tool_material = tag[1]
-                self.tool_material_level = tag[0]
-                break
+        #对工具的判断（工具类型、材质、材质等级）
+        self.tool_type, self.tool_material, self.tool_material_level = _get_item_info(name)
             
     def __str__(self) -> str:
         return f"{self.name} x{self.count}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     """实体信息 - 通用实体结构供所有事件复用"""
     id: Optional[int] = None
@@ -254,9 +431,9 @@ class Entity:
             return cls(
                 id=entity.get('id'),
                 uuid=entity.get('uuid'),
-                type=entity.get('type'),
-                name=entity.get('name'),
-                username=entity.get('username'),
+                type=_intern(entity.get('type')),
+                name=_intern(entity.get('name')),
+                username=_intern(entity.get('username')),
                 count=entity.get('count'),
                 position=cls._parse_position(entity.get('position')),
                 health=entity.get('health'),
@@ -332,11 +509,13 @@ class Entity:
     def __str__(self) -> str:
         display_name = self.username or self.name or "未知实体"
         if self.position:
-            return f"{display_name} - 坐标: ({self.position.x:.1f}, {self.position.y:.1f}, {self.position.z:.1f})"
+            return f"{display_name} - 坐标: {_entity_coord_str(self.position)}"
         return f"{display_name}"
 
 class AnimalEntity(Entity):
     """动物实体信息"""
+    __slots__ = ()
+    
     def __init__(self, type: Optional[str] = None, name: Optional[str] = None, position: Optional[Position] = None, id: Optional[int] = None, uuid: Optional[str] = None, username: Optional[str] = None, count: Optional[int] = None, health: Optional[int] = None, food: Optional[int] = None, distance: Optional[float] = None, max_health: Optional[int] = None):
         super().__init__(
             id=id,
@@ -355,11 +534,13 @@ class AnimalEntity(Entity):
     def __str__(self) -> str:
         display_name = self.name or "未知动物"
         if self.position:
-            return f"动物：{display_name} - 坐标: ({self.position.x:.1f}, {self.position.y:.1f}, {self.position.z:.1f})"
+            return f"动物：{display_name} - 坐标: {_entity_coord_str(self.position)}"
         return f"动物：{display_name}"
 
 class ItemEntity(Entity):
     """物品实体信息"""
+    __slots__ = ("item_name",)
+    
     def __init__(self, type: Optional[str] = None, name: Optional[str] = None, position: Optional[Position] = None, item_name: Optional[str] = None, count: Optional[int] = None, id: Optional[int] = None, uuid: Optional[str] = None, username: Optional[str] = None, health: Optional[int] = None, food: Optional[int] = None, distance: Optional[float] = None, max_health: Optional[int] = None):
         super().__init__(
             id=id,
@@ -380,11 +561,13 @@ class ItemEntity(Entity):
         display_name = self.item_name or self.name or "未知物品"
         count_str = f" x {self.count}" if self.count else ""
         if self.position:
-            return f"掉落物：{display_name}{count_str} - 坐标: ({self.position.x:.1f}, {self.position.y:.1f}, {self.position.z:.1f})"
+            return f"掉落物：{display_name}{count_str} - 坐标: {_entity_coord_str(self.position)}"
         return f"掉落物：{display_name}{count_str}"
             
 class PlayerEntity(Entity):
     """玩家实体信息"""
+    __slots__ = ()
+    
     def __init__(self, type: Optional[str] = None, name: Optional[str] = None, position: Optional[Position] = None, username: Optional[str] = None, id: Optional[int] = None, uuid: Optional[str] = None, count: Optional[int] = None, health: Optional[int] = None, food: Optional[int] = None, distance: Optional[float] = None, max_health: Optional[int] = None):
         super().__init__(
             id=id,
@@ -403,7 +586,7 @@ class PlayerEntity(Entity):
     def __str__(self) -> str:
         display_name = self.username or self.name or "未知玩家"
         if self.position:
-            return f"玩家：{display_name} - 坐标: ({self.position.x:.1f}, {self.position.y:.1f}, {self.position.z:.1f})"
+            return f"玩家：{display_name} - 坐标: {_entity_coord_str(self.position)}"
         return f"玩家：{display_name}"
     
     
@@ -411,6 +594,9 @@ class PlayerEntity(Entity):
 
 class CachedBlock:
     """缓存的方块信息"""
+    # 方块缓存中每个已知方块一个实例，使用 __slots__ 省去实例字典
+    __slots__ = ("block_type", "position", "can_see", "last_seen", "first_seen", "seen_count")
+    
     def __init__(self, block_type: str, position: BlockPosition, can_see: bool, last_seen: datetime, first_seen: datetime, seen_count: int = 1) -> None:
         self.block_type = block_type
         self.position = position
@@ -435,7 +621,7 @@ class CachedBlock:
         """从字典创建对象"""
         return cls(
             block_type=data["block_type"],
-            position=BlockPosition(data["position"]),
+            position=BlockPosition.from_dict(data["position"]),
             can_see=data["can_see"] if "can_see" in data else True,
             last_seen=datetime.fromisoformat(data["last_seen"]),
             first_seen=datetime.fromisoformat(data["first_seen"]),
@@ -443,18 +629,22 @@ class CachedBlock:
         )
     
     def __hash__(self):
-        """使对象可哈希，用于集合操作"""
-        return hash((self.position.x, self.position.y, self.position.z))
+        """使对象可哈希，用于集合操作（复用方块坐标已缓存的哈希值）"""
+        return hash(self.position)
     
     def __eq__(self, other):
         """比较两个方块是否在同一位置"""
         if not isinstance(other, CachedBlock):
             return False
-        return (self.position.x, self.position.y, self.position.z) == (other.position.x, other.position.y, other.position.z)
+        position = self.position
+        other_position = other.position
+        return position.x == other_position.x and position.y == other_position.y and position.z == other_position.z
 
 
 class PlayerPositionCache:
     """玩家位置和视角信息缓存"""
+    __slots__ = ("player_name", "position", "yaw", "pitch", "timestamp")
+    
     def __init__(self, player_name: str, position: Position, yaw: float, pitch: float, timestamp: datetime):
         self.player_name = player_name
         self.position = position
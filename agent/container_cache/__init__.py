@@ -1,3 +1,3 @@
-from .container_cache import global_container_cache, ContainerInfo, GlobalContainerCache
+from .container_cache import global_container_cache, get_global_container_cache, ContainerInfo, GlobalContainerCache
 
-__all__ = ['global_container_cache', 'ContainerInfo', 'GlobalContainerCache']
\ No newline at end of file
+__all__ = ['global_container_cache', 'get_global_container_cache', 'ContainerInfo', 'GlobalContainerCache']
\ No newline at end of file
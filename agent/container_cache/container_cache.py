@@ -1,16 +1,56 @@
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
-import json
+from collections import defaultdict
+from operator import itemgetter
+import atexit
+import functools
+import heapq
+import math
 import os
+import threading
+import time
+import numpy as np
 from utils.logger import get_logger
 from agent.common.basic_class import BlockPosition
 from agent.block_cache.block_cache import global_block_cache
+from agent.utils.json_utils import json_dumps, json_loads
 
 logger = get_logger("ContainerCache")
 
+# 合并写盘的去抖间隔（秒），连续的多次修改只会触发一次保存
+SAVE_DEBOUNCE_INTERVAL = 0.25
 
-@dataclass
+# 空间网格的格子边长（方块），用于加速附近容器查询
+GRID_CELL_SIZE = 32
+
+# 需要全量遍历且容器数超过该值时，使用 NumPy 向量化计算距离
+NUMPY_MIN_CONTAINERS = 256
+
+# 容器存在性验证结果的缓存有效期（秒）
+VERIFY_CACHE_TTL = 2.0
+
+# 容器位置键类型：(x, y, z)，比字符串键哈希更快且无需格式化
+PositionKey = Tuple[int, int, int]
+
+
+def _positive_counts(counts: Optional[Dict[str, int]], copy: bool = False) -> Optional[Dict[str, int]]:
+    """只保留数量大于 0 的物品；无需过滤且不要求复制时直接返回原字典"""
+    if counts is None:
+        return None
+    if copy or any(count <= 0 for count in counts.values()):
+        return {name: count for name, count in counts.items() if count > 0}
+    return counts
+
+
+def _positive_slots(slots: Optional[Dict[str, Dict[str, int]]], copy: bool = False) -> Optional[Dict[str, Dict[str, int]]]:
+    """对熔炉各槽位分别过滤掉数量为 0 的物品"""
+    if slots is None:
+        return None
+    return {slot_name: _positive_counts(items, copy) for slot_name, items in slots.items()}
+
+
+@dataclass(slots=True)
 class ContainerInfo:
     """容器信息数据类"""
     position: BlockPosition
@@ -30,53 +70,203 @@ class GlobalContainerCache:
     """全局容器缓存管理器"""
     
     def __init__(self):
-        self.chest_cache: Dict[str, ContainerInfo] = {}
-        self.furnace_cache: Dict[str, ContainerInfo] = {}
+        # 箱子与熔炉共用一个缓存，通过 container_type 区分
+        self.container_cache: Dict[PositionKey, ContainerInfo] = {}
+        # 空间网格索引：格子坐标 -> 该格子内的容器位置键
+        self._grid: Dict[Tuple[int, int, int], Set[PositionKey]] = defaultdict(set)
+        # 容器坐标的结构数组（SoA），与 container_cache 同步，用于向量化距离计算
+        self._position_array = np.empty((64, 3), dtype=np.int64)
+        self._array_keys: List[PositionKey] = []
+        self._array_index: Dict[PositionKey, int] = {}
+        # 验证查询缓存：位置键 -> (查询时间, 该位置的方块类型，无方块时为 None)
+        # 只按位置缓存方块类型，与容器类型无关，位置变化时按位置键失效即可
+        self._verify_cache: Dict[PositionKey, Tuple[float, Optional[str]]] = {}
+        # 上次成功落盘（或从文件加载）时的内容签名，内容未变化时跳过写盘
+        self._last_saved_signature: Optional[int] = None
         self.data_file = "data/container_cache.json"
+        # 脏标记与保存锁：修改只置脏，由后台线程合并写盘
+        self._dirty = threading.Event()
+        self._save_lock = threading.Lock()
         self._ensure_data_dir()
         self._load_data()
+        # 方块缓存中的方块变化（放置、破坏、类型改变）时，清除对应位置的验证缓存
+        global_block_cache.add_block_change_listener(self._on_block_changed)
+        
+        # 启动后台保存线程，并在退出时确保数据落盘
+        self._save_thread = threading.Thread(target=self._save_loop, name="ContainerCacheSaver", daemon=True)
+        self._save_thread.start()
+        atexit.register(self._flush)
         logger.info("容器缓存管理器初始化完成")
     
-    def _get_position_key(self, position: BlockPosition) -> str:
+    @property
+    def chest_cache(self) -> Dict[PositionKey, ContainerInfo]:
+        """箱子缓存视图（兼容旧接口）"""
+        return {key: c for key, c in self.container_cache.items() if c.container_type == "chest"}
+    
+    @property
+    def furnace_cache(self) -> Dict[PositionKey, ContainerInfo]:
+        """熔炉缓存视图（兼容旧接口）"""
+        return {key: c for key, c in self.container_cache.items() if c.container_type != "chest"}
+    
+    @staticmethod
+    def _get_position_key(position: BlockPosition) -> PositionKey:
         """获取位置的唯一键"""
-        return f"{position.x}_{position.y}_{position.z}"
+        return position.xyz
+    
+    @staticmethod
+    def _get_grid_cell(x: int, y: int, z: int) -> Tuple[int, int, int]:
+        """获取坐标所在的网格格子"""
+        return (x // GRID_CELL_SIZE, y // GRID_CELL_SIZE, z // GRID_CELL_SIZE)
+    
+    def _put_container(self, position_key: PositionKey, container: ContainerInfo) -> None:
+        """写入容器缓存并更新空间网格索引"""
+        old_container = self.container_cache.get(position_key)
+        if old_container is not None:
+            self._unindex_container(position_key, old_container)
+        self._invalidate_verify_cache(position_key)
+        self.container_cache[position_key] = container
+        pos = container.position
+        self._grid[self._get_grid_cell(pos.x, pos.y, pos.z)].add(position_key)
+        
+        # 同步坐标数组
+        if position_key not in self._array_index:
+            count = len(self._array_keys)
+            if count == len(self._position_array):
+                self._position_array = np.resize(self._position_array, (count * 2, 3))
+            self._position_array[count] = position_key
+            self._array_keys.append(position_key)
+            self._array_index[position_key] = count
+    
+    def _pop_container(self, position_key: PositionKey) -> Optional[ContainerInfo]:
+        """从容器缓存中移除并更新空间网格索引"""
+        container = self.container_cache.pop(position_key, None)
+        if container is not None:
+            self._unindex_container(position_key, container)
+        self._invalidate_verify_cache(position_key)
+        
+        # 从坐标数组中移除：用最后一行填补空位
+        index = self._array_index.pop(position_key, None)
+        if index is not None:
+            last_key = self._array_keys.pop()
+            if last_key != position_key:
+                self._position_array[index] = self._position_array[len(self._array_keys)]
+                self._array_keys[index] = last_key
+                self._array_index[last_key] = index
+        return container
+    
+    def _unindex_container(self, position_key: PositionKey, container: ContainerInfo) -> None:
+        """从空间网格中移除容器"""
+        pos = container.position
+        cell = self._get_grid_cell(pos.x, pos.y, pos.z)
+        keys = self._grid.get(cell)
+        if keys is not None:
+            keys.discard(position_key)
+            if not keys:
+                del self._grid[cell]
     
     def _ensure_data_dir(self):
         """确保数据目录存在"""
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
     
+    def _mark_dirty(self):
+        """标记缓存已修改，由后台线程延迟保存"""
+        self._dirty.set()
+    
+    def _save_loop(self):
+        """后台保存循环：等待脏标记，去抖后合并为一次写盘"""
+        while True:
+            self._dirty.wait()
+            time.sleep(SAVE_DEBOUNCE_INTERVAL)
+            self._save_if_dirty()
+    
+    def _flush(self):
+        """立即保存尚未写盘的修改（退出时调用），会先等待后台线程正在进行的写盘完成"""
+        self._save_if_dirty()
+    
+    def _save_if_dirty(self):
+        """持有保存锁检查并清除脏标记后写盘，避免后台线程与退出保存交错导致修改丢失"""
+        with self._save_lock:
+            if not self._dirty.is_set():
+                return
+            self._dirty.clear()
+            self._write_data()
+    
     def _save_data(self):
         """保存数据到文件"""
+        with self._save_lock:
+            self._write_data()
+    
+    def _write_data(self):
+        """序列化缓存并写入文件（调用方需持有保存锁）
+
+        先写入临时文件再原子替换目标文件，避免写入中途崩溃导致缓存文件损坏
+        """
+        tmp_file = self.data_file + ".tmp"
         try:
-            data = {
-                "chests": {},
-                "furnaces": {}
-            }
-            
-            # 转换箱子数据
-            for key, container in self.chest_cache.items():
-                data["chests"][key] = {
-                    "position": container.position.to_dict(),
-                    "container_type": container.container_type,
-                    "inventory": container.inventory,
-                    "furnace_slots": container.furnace_slots
-                }
-            
-            # 转换熔炉数据
-            for key, container in self.furnace_cache.items():
-                data["furnaces"][key] = {
-                    "position": container.position.to_dict(),
-                    "container_type": container.container_type,
-                    "inventory": container.inventory,
-                    "furnace_slots": container.furnace_slots
-                }
+            # 先取快照，避免与主线程的修改冲突；文件中仍按箱子/熔炉分区保存
+            items = list(self.container_cache.items())
+            signature = self._snapshot_signature(items)
+            if signature == self._last_saved_signature:
+                logger.debug("容器缓存内容未变化，跳过保存")
+                return
             
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            chests = [item for item in items if item[1].container_type == "chest"]
+            furnaces = [item for item in items if item[1].container_type != "chest"]
             
+            # 逐个容器流式写入，不在内存中构建完整的数据树
+            with open(tmp_file, 'wb') as f:
+                f.write(b'{"chests":{')
+                self._write_container_section(f, chests)
+                f.write(b'},"furnaces":{')
+                self._write_container_section(f, furnaces)
+                f.write(b'}}')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            self._last_saved_signature = signature
+
             logger.debug(f"容器缓存数据已保存到: {self.data_file}")
         except Exception as e:
             logger.error(f"保存容器缓存数据失败: {e}")
+            # 清理残留的临时文件
+            try:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _snapshot_signature(items) -> int:
+        """计算缓存快照的内容签名，用于判断是否需要重新写盘"""
+        return hash(tuple(
+            (
+                key,
+                container.container_type,
+                tuple(container.inventory.items()),
+                tuple((slot_name, tuple(slot_items.items())) for slot_name, slot_items in container.furnace_slots.items())
+            )
+            for key, container in items
+        ))
+    
+    def _write_container_section(self, f, items) -> None:
+        """将一组容器以 "key": {...} 的形式逐个写入文件"""
+        for index, (key, container) in enumerate(items):
+            if index:
+                f.write(b",")
+            # JSON 对象键只能是字符串，落盘时转换为 "x_y_z" 格式
+            f.write(json_dumps(f"{key[0]}_{key[1]}_{key[2]}"))
+            f.write(b":")
+            f.write(self._container_to_json(container))
+    
+    @staticmethod
+    def _container_to_json(container: ContainerInfo) -> bytes:
+        """生成单个容器的 JSON 片段"""
+        return json_dumps({
+            "position": container.position.to_dict(),
+            "container_type": container.container_type,
+            "inventory": container.inventory,
+            "furnace_slots": container.furnace_slots
+        })
     
     def _load_data(self):
         """从文件加载数据"""
@@ -85,63 +275,115 @@ class GlobalContainerCache:
                 logger.info(f"容器缓存数据文件不存在: {self.data_file}")
                 return
             
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 加载箱子数据
-            for key, container_data in data.get("chests", {}).items():
-                position = BlockPosition(**container_data["position"])
-                self.chest_cache[key] = ContainerInfo(
-                    position=position,
-                    container_type=container_data["container_type"],
-                    inventory=container_data.get("inventory", {}),
-                    furnace_slots=container_data.get("furnace_slots", {})
-                )
+            with open(self.data_file, 'rb') as f:
+                data = json_loads(f.read())
             
-            # 加载熔炉数据
-            for key, container_data in data.get("furnaces", {}).items():
-                position = BlockPosition(**container_data["position"])
-                self.furnace_cache[key] = ContainerInfo(
-                    position=position,
-                    container_type=container_data["container_type"],
-                    inventory=container_data.get("inventory", {}),
-                    furnace_slots=container_data.get("furnace_slots", {})
-                )
+            # 加载箱子和熔炉数据
+            chest_count = 0
+            furnace_count = 0
+            for section in ("chests", "furnaces"):
+                # 文件中的字符串键仅用于可读性，内存中的元组键由坐标重建
+                for container_data in data.get(section, {}).values():
+                    position = BlockPosition(**container_data["position"])
+                    container = ContainerInfo(
+                        position=position,
+                        container_type=container_data["container_type"],
+                        inventory=_positive_counts(container_data.get("inventory")),
+                        furnace_slots=_positive_slots(container_data.get("furnace_slots"))
+                    )
+                    self._put_container(self._get_position_key(position), container)
+                    if container.container_type == "chest":
+                        chest_count += 1
+                    else:
+                        furnace_count += 1
             
-            logger.info(f"容器缓存数据已加载: {len(self.chest_cache)} 个箱子, {len(self.furnace_cache)} 个熔炉")
+            # 文件内容与内存一致，后续无变化的保存可以直接跳过
+            self._last_saved_signature = self._snapshot_signature(list(self.container_cache.items()))
+            logger.info(f"容器缓存数据已加载: {chest_count} 个箱子, {furnace_count} 个熔炉")
         except Exception as e:
             logger.error(f"加载容器缓存数据失败: {e}")
     
-    def verify_container_exists(self, position: BlockPosition, container_type: str) -> bool:
-        """验证容器是否实际存在于指定位置"""
+    def verify_container_exists(self, position: BlockPosition, container_type: str, use_cache: bool = True) -> bool:
+        """验证容器是否实际存在于指定位置
+        
+        use_cache 为 True 时，VERIFY_CACHE_TTL 秒内的重复验证直接使用上次查询到的方块类型
+        """
+        key = self._get_position_key(position)
+        cached = self._verify_cache.get(key) if use_cache else None
+        if cached is not None and time.monotonic() - cached[0] < VERIFY_CACHE_TTL:
+            return self._block_matches_container(cached[1], container_type)
+        
         try:
             block = global_block_cache.get_block(position.x, position.y, position.z)
-            
-            if container_type == "chest":
-                return block.block_type == "chest"
-            elif container_type == "furnace":
-                return block.block_type in ["furnace", "blast_furnace", "smoker"]
-            
-            return False
         except Exception as e:
             logger.warning(f"验证容器存在性时出错: {e}")
             return False
+        
+        block_type = block.block_type if block is not None else None
+        self._verify_cache[key] = (time.monotonic(), block_type)
+        return self._block_matches_container(block_type, container_type)
+    
+    def _verify_containers(self, containers: List[ContainerInfo], use_cache: bool = True) -> Dict[PositionKey, bool]:
+        """批量验证容器是否存在：一次性从方块缓存取出所有位置，同一位置只查询一次"""
+        now = time.monotonic()
+        results = {}
+        pending = {}
+        for container in containers:
+            key = self._get_position_key(container.position)
+            container_type = "chest" if container.container_type == "chest" else "furnace"
+            cached = self._verify_cache.get(key) if use_cache else None
+            if cached is not None and now - cached[0] < VERIFY_CACHE_TTL:
+                results[key] = self._block_matches_container(cached[1], container_type)
+            else:
+                pending[key] = container_type
+        
+        if not pending:
+            return results
+        
+        try:
+            blocks = global_block_cache.get_blocks(list(pending))
+        except Exception as e:
+            logger.warning(f"批量验证容器存在性时出错: {e}")
+            return results
+        
+        for key, container_type in pending.items():
+            block = blocks.get(key)
+            block_type = block.block_type if block is not None else None
+            self._verify_cache[key] = (now, block_type)
+            results[key] = self._block_matches_container(block_type, container_type)
+        return results
+    
+    def _invalidate_verify_cache(self, position_key: PositionKey) -> None:
+        """清除指定位置的验证缓存"""
+        self._verify_cache.pop(position_key, None)
+    
+    def _on_block_changed(self, position_key: Optional[PositionKey]) -> None:
+        """方块缓存变化回调：position_key 为 None 表示方块缓存被整体清空"""
+        if position_key is None:
+            self._verify_cache.clear()
+        else:
+            self._invalidate_verify_cache(position_key)
+    
+    @staticmethod
+    def _block_matches_container(block_type: Optional[str], container_type: str) -> bool:
+        """判断方块类型是否与容器类型匹配"""
+        if block_type is None:
+            return False
+        if container_type == "chest":
+            return block_type == "chest"
+        elif container_type == "furnace":
+            return block_type in ["furnace", "blast_furnace", "smoker"]
+        return False
     
     def remove_container_from_cache(self, position: BlockPosition) -> None:
         """从缓存中移除容器"""
         position_key = self._get_position_key(position)
         
-        # 尝试从箱子缓存中移除
-        if position_key in self.chest_cache:
-            del self.chest_cache[position_key]
-            logger.info(f"从缓存中移除箱子: {position.x}, {position.y}, {position.z}")
-            self._save_data()
-        
-        # 尝试从熔炉缓存中移除
-        if position_key in self.furnace_cache:
-            del self.furnace_cache[position_key]
-            logger.info(f"从缓存中移除熔炉: {position.x}, {position.y}, {position.z}")
-            self._save_data()
+        container = self._pop_container(position_key)
+        if container is not None:
+            container_name = "箱子" if container.container_type == "chest" else "熔炉"
+            logger.info(f"从缓存中移除{container_name}: {position.x}, {position.y}, {position.z}")
+            self._mark_dirty()
     
     def get_container_info_with_verify(self, position: BlockPosition):
         """获取指定位置的容器信息，并验证容器是否实际存在"""
@@ -156,17 +398,18 @@ class GlobalContainerCache:
         
         return container_info
     
-    def get_nearby_containers_with_verify(self, center_position: BlockPosition, radius: float = 20.0) -> List[ContainerInfo]:
+    def get_nearby_containers_with_verify(self, center_position: BlockPosition, radius: float = 20.0, max_count: int = None) -> List[ContainerInfo]:
         """获取附近的容器，并验证每个容器是否实际存在"""
         # 获取缓存中的容器列表
-        cached_containers = self.get_nearby_containers(center_position, radius)
+        cached_containers = self.get_nearby_containers(center_position, radius, max_count)
         
-        # 验证每个容器是否实际存在
+        # 批量验证每个容器是否实际存在
+        verify_results = self._verify_containers(cached_containers)
         valid_containers = []
         removed_positions = []
         
         for container in cached_containers:
-            if self.verify_container_exists(container.position, container.container_type):
+            if verify_results.get(self._get_position_key(container.position), False):
                 valid_containers.append(container)
             else:
                 removed_positions.append(container.position)
@@ -185,268 +428,241 @@ class GlobalContainerCache:
         if specific_position:
             # 只检查指定位置的容器
             position_key = self._get_position_key(specific_position)
-            
-            # 检查箱子缓存
-            if position_key in self.chest_cache:
-                container = self.chest_cache[position_key]
-                if not self.verify_container_exists(container.position, "chest"):
-                    logger.warning(f"位置 {container.position.x}, {container.position.y}, {container.position.z} 的箱子已不存在，从缓存中移除")
-                    del self.chest_cache[position_key]
-                    removed_count += 1
-            
-            # 检查熔炉缓存
-            if position_key in self.furnace_cache:
-                container = self.furnace_cache[position_key]
-                if not self.verify_container_exists(container.position, "furnace"):
-                    logger.warning(f"位置 {container.position.x}, {container.position.y}, {container.position.z} 的熔炉已不存在，从缓存中移除")
-                    del self.furnace_cache[position_key]
-                    removed_count += 1
+            container = self.container_cache.get(position_key)
+            candidates = [(position_key, container)] if container is not None else []
         else:
             # 检查所有容器（保留原功能以备后用）
-            chest_keys_to_remove = []
-            for key, container in list(self.chest_cache.items()):
-                if not self.verify_container_exists(container.position, "chest"):
-                    chest_keys_to_remove.append(key)
-            
-            furnace_keys_to_remove = []
-            for key, container in list(self.furnace_cache.items()):
-                if not self.verify_container_exists(container.position, "furnace"):
-                    furnace_keys_to_remove.append(key)
-            
-            # 移除不存在的箱子
-            for key in chest_keys_to_remove:
-                container = self.chest_cache[key]
-                logger.warning(f"位置 {container.position.x}, {container.position.y}, {container.position.z} 的箱子已不存在，从缓存中移除")
-                del self.chest_cache[key]
-                removed_count += 1
-            
-            # 移除不存在的熔炉
-            for key in furnace_keys_to_remove:
-                container = self.furnace_cache[key]
-                logger.warning(f"位置 {container.position.x}, {container.position.y}, {container.position.z} 的熔炉已不存在，从缓存中移除")
-                del self.furnace_cache[key]
+            candidates = list(self.container_cache.items())
+        
+        # 先收集所有位置，一次性批量验证；清理通常发生在方块变化之后，因此不使用验证缓存
+        verify_results = self._verify_containers([container for _, container in candidates], use_cache=False)
+        
+        for key, container in candidates:
+            is_chest = container.container_type == "chest"
+            if not verify_results.get(key, False):
+                container_name = "箱子" if is_chest else "熔炉"
+                logger.warning(f"位置 {container.position.x}, {container.position.y}, {container.position.z} 的{container_name}已不存在，从缓存中移除")
+                self._pop_container(key)
                 removed_count += 1
         
         # 如果有移除的容器，保存数据
         if removed_count > 0:
-            self._save_data()
+            self._mark_dirty()
             logger.info(f"清理了 {removed_count} 个不存在的容器")
         
         return removed_count
     
-    def add_container(self, position: BlockPosition, container_type: str, inventory: Dict[str, int] = None, furnace_slots: Dict[str, Dict[str, int]] = None) -> None:
-        """添加容器到缓存"""
-        position_key = self._get_position_key(position)
+    def add_container(self, position: BlockPosition, container_type: str, inventory: Dict[str, int] = None, furnace_slots: Dict[str, Dict[str, int]] = None, copy: bool = False) -> None:
+        """添加容器到缓存
         
-        # 选择对应的缓存
-        target_cache = self.chest_cache if container_type == "chest" else self.furnace_cache
+        数量为 0 的物品在写入时即被过滤。默认直接持有传入的 inventory/furnace_slots，
+        调用方之后仍会修改它们时需传入 copy=True
+        """
+        position_key = self._get_position_key(position)
+        inventory = _positive_counts(inventory, copy)
+        furnace_slots = _positive_slots(furnace_slots, copy)
         
-        if position_key in target_cache:
+        container = self.container_cache.get(position_key)
+        if container is not None and container.container_type == container_type:
             # 更新现有缓存
             if inventory is not None:
-                target_cache[position_key].inventory = dict(inventory)
+                container.inventory = inventory
             if furnace_slots is not None:
-                target_cache[position_key].furnace_slots = dict(furnace_slots)
+                container.furnace_slots = furnace_slots
         else:
-            # 创建新缓存
-            target_cache[position_key] = ContainerInfo(
+            # 创建新缓存（同一位置的容器类型变化时直接覆盖）
+            self._put_container(position_key, ContainerInfo(
                 position=position,
                 container_type=container_type,
-                inventory=dict(inventory) if inventory else {},
-                furnace_slots=dict(furnace_slots) if furnace_slots else {}
-            )
+                inventory=inventory if inventory else {},
+                furnace_slots=furnace_slots if furnace_slots else {}
+            ))
         logger.info(f"添加容器到缓存: {container_type} at ({position.x}, {position.y}, {position.z})")
         
-        # 自动保存数据
-        self._save_data()
+        # 标记待保存，由后台线程合并写盘
+        self._mark_dirty()
     
     
-    def get_nearby_containers(self, center_position: BlockPosition, radius: float = 20.0) -> List[ContainerInfo]:
-        """获取附近的容器"""
-        nearby_containers = []
+    def get_nearby_containers(self, center_position: BlockPosition, radius: float = 20.0, max_count: int = None) -> List[ContainerInfo]:
+        """获取附近的容器，按距离由近到远排序；指定 max_count 时只返回最近的若干个"""
         radius_squared = radius * radius
+        # 中心坐标提前取为局部变量，避免循环内重复属性访问
+        cx, cy, cz = center_position.x, center_position.y, center_position.z
         
-        # 合并两个缓存
-        all_containers = list(self.chest_cache.values()) + list(self.furnace_cache.values())
+        grid_candidates = self._get_grid_candidates(center_position, radius)
+        if grid_candidates is None and len(self.container_cache) > NUMPY_MIN_CONTAINERS:
+            # 容器很多且需要全量遍历时，用 NumPy 一次算出所有距离
+            candidates = self._find_in_radius_numpy(cx, cy, cz, radius_squared)
+        else:
+            candidates = []
+            append = candidates.append
+            containers = grid_candidates if grid_candidates is not None else self.container_cache.values()
+            for container_info in containers:
+                pos = container_info.position
+                dx = pos.x - cx
+                dy = pos.y - cy
+                dz = pos.z - cz
+                distance_squared = dx * dx + dy * dy + dz * dz
+                
+                if distance_squared <= radius_squared:
+                    append((distance_squared, container_info))
         
-        for container_info in all_containers:
-            pos = container_info.position
-            dx = pos.x - center_position.x
-            dy = pos.y - center_position.y
-            dz = pos.z - center_position.z
-            distance_squared = dx * dx + dy * dy + dz * dz
-            
-            if distance_squared <= radius_squared:
-                nearby_containers.append(container_info)
-        
-        # 按距离排序
-        nearby_containers.sort(key=lambda c: (
-            (c.position.x - center_position.x) ** 2 +
-            (c.position.y - center_position.y) ** 2 +
-            (c.position.z - center_position.z) ** 2
-        ))
+        # 按距离排序（距离只计算一次），只需前若干个时用堆避免全量排序
+        if max_count is not None:
+            nearest = heapq.nsmallest(max_count, candidates, key=itemgetter(0))
+        else:
+            nearest = sorted(candidates, key=itemgetter(0))
         
-        return nearby_containers
+        return [container_info for _, container_info in nearest]
+    
+    def _find_in_radius_numpy(self, cx: int, cy: int, cz: int, radius_squared: float) -> List[Tuple[int, ContainerInfo]]:
+        """基于坐标数组向量化筛选半径内的容器，返回 (距离平方, 容器) 列表"""
+        count = len(self._array_keys)
+        diff = self._position_array[:count] - np.array([cx, cy, cz], dtype=np.int64)
+        distance_squared = np.einsum('ij,ij->i', diff, diff)
+        indices = np.nonzero(distance_squared <= radius_squared)[0]
+        return [
+            (int(distance_squared[i]), self.container_cache[self._array_keys[i]])
+            for i in indices.tolist()
+        ]
+    
+    def _get_grid_candidates(self, center_position: BlockPosition, radius: float) -> Optional[List[ContainerInfo]]:
+        """通过空间网格获取可能在半径内的容器；半径过大、需要全量遍历时返回 None"""
+        min_cell = self._get_grid_cell(
+            math.floor(center_position.x - radius),
+            math.floor(center_position.y - radius),
+            math.floor(center_position.z - radius)
+        )
+        max_cell = self._get_grid_cell(
+            math.floor(center_position.x + radius),
+            math.floor(center_position.y + radius),
+            math.floor(center_position.z + radius)
+        )
+        cell_count = (
+            (max_cell[0] - min_cell[0] + 1) *
+            (max_cell[1] - min_cell[1] + 1) *
+            (max_cell[2] - min_cell[2] + 1)
+        )
+        
+        # 需要检查的格子数比已有格子还多时，直接遍历全部容器更快
+        if cell_count >= len(self._grid):
+            return None
+        
+        candidates = []
+        for cx in range(min_cell[0], max_cell[0] + 1):
+            for cy in range(min_cell[1], max_cell[1] + 1):
+                for cz in range(min_cell[2], max_cell[2] + 1):
+                    keys = self._grid.get((cx, cy, cz))
+                    if keys:
+                        candidates.extend(self.container_cache[key] for key in keys)
+        return candidates
     
     def get_container_info(self, position: BlockPosition) -> ContainerInfo:
         """获取指定位置的容器信息"""
         position_key = self._get_position_key(position)
-        # 先在箱子缓存中查找，再在熔炉缓存中查找
-        return self.chest_cache.get(position_key) or self.furnace_cache.get(position_key)
+        return self.container_cache.get(position_key)
     
-    def update_container_inventory(self, position: BlockPosition, inventory: Dict[str, int], furnace_slots: Dict[str, Dict[str, int]] = None) -> bool:
-        """更新容器库存信息"""
+    def update_container_inventory(self, position: BlockPosition, inventory: Optional[Dict[str, int]], furnace_slots: Dict[str, Dict[str, int]] = None, copy: bool = False) -> bool:
+        """更新容器库存信息
+        
+        数量为 0 的物品在写入时即被过滤。默认直接持有传入的字典，调用方之后仍会修改它们时需传入 copy=True
+        inventory 为 None 时视为空库存
+        """
+        if inventory is None:
+            inventory = {}
         position_key = self._get_position_key(position)
-        # 先在箱子缓存中查找，再在熔炉缓存中查找
-        if position_key in self.chest_cache:
-            self.chest_cache[position_key].inventory = dict(inventory)
-            if furnace_slots is not None:
-                self.chest_cache[position_key].furnace_slots = dict(furnace_slots)
-            # 自动保存数据
-            self._save_data()
-            return True
-        elif position_key in self.furnace_cache:
-            self.furnace_cache[position_key].inventory = dict(inventory)
-            if furnace_slots is not None:
-                self.furnace_cache[position_key].furnace_slots = dict(furnace_slots)
-            # 自动保存数据
-            self._save_data()
+        container = self.container_cache.get(position_key)
+        if container is None:
+            return False
+        
+        inventory = _positive_counts(inventory, copy)
+        furnace_slots = _positive_slots(furnace_slots, copy)
+        
+        # 内容没有变化时（例如重复查看同一个箱子）无需写盘
+        if container.inventory == inventory and (furnace_slots is None or container.furnace_slots == furnace_slots):
             return True
-        return False
+        
+        container.inventory = inventory
+        if furnace_slots is not None:
+            container.furnace_slots = furnace_slots
+        # 标记待保存，由后台线程合并写盘
+        self._mark_dirty()
+        return True
     
     def get_cache_info(self) -> str:
         """获取容器缓存信息的字符串表示"""
-        if not self.chest_cache and not self.furnace_cache:
+        if not self.container_cache:
             return "附近没有已知的容器"
         
-        chests = list(self.chest_cache.values())
-        furnaces = list(self.furnace_cache.values())
+        all_containers = list(self.container_cache.values())
+        chest_count = sum(1 for c in all_containers if c.container_type == "chest")
         
         info_lines = []
-        info_lines.append(f"已知的容器: 总共 {len(self.chest_cache) + len(self.furnace_cache)} 个")
-        info_lines.append(f"- 箱子: {len(chests)} 个")
-        info_lines.append(f"- 熔炉: {len(furnaces)} 个")
+        info_lines.append(f"已知的容器: 总共 {len(all_containers)} 个")
+        info_lines.append(f"- 箱子: {chest_count} 个")
+        info_lines.append(f"- 熔炉: {len(all_containers) - chest_count} 个")
         
-        if self.chest_cache or self.furnace_cache:
+        if all_containers:
             info_lines.append("\n附近容器详情:")
-            all_containers = list(self.chest_cache.values()) + list(self.furnace_cache.values())
             for container in all_containers[:5]:  # 只显示前5个
                 pos = container.position
-                container_line = f"- {container.container_type} at ({pos.x}, {pos.y}, {pos.z})"
-                
-                # 添加内容物信息
-                if container.container_type == "furnace" and container.furnace_slots:
-                    # 熔炉特殊显示格式
-                    input_items = []
-                    fuel_items = []
-                    output_items = []
-                    
-                    for slot_name, items in container.furnace_slots.items():
-                        for item_name, count in items.items():
-                            if count > 0:
-                                item_str = f"{item_name} x{count}"
-                                if slot_name == "input":
-                                    input_items.append(item_str)
-                                elif slot_name == "fuel":
-                                    fuel_items.append(item_str)
-                                elif slot_name == "output":
-                                    output_items.append(item_str)
-                    
-                    slot_info = []
-                    if input_items:
-                        slot_info.append(f"输入: {', '.join(input_items)}")
-                    if fuel_items:
-                        slot_info.append(f"燃料: {', '.join(fuel_items)}")
-                    if output_items:
-                        slot_info.append(f"输出: {', '.join(output_items)}")
-                    
-                    if slot_info:
-                        container_line += f" [{'; '.join(slot_info)}]"
-                    else:
-                        container_line += " [空]"
-                else:
-                    # 普通容器显示格式
-                    if container.inventory:
-                        items = []
-                        for item_name, count in container.inventory.items():
-                            if count > 0:
-                                items.append(f"{item_name} x{count}")
-                        if items:
-                            container_line += f" [{', '.join(items)}]"
-                        else:
-                            container_line += " [空]"
-                    else:
-                        container_line += " [空]"
-                
-                info_lines.append(container_line)
+                contents = _format_container_contents(container)
+                info_lines.append(f"- {container.container_type} at ({pos.x}, {pos.y}, {pos.z}){contents}")
         
         return "\n".join(info_lines)
     
     def get_nearby_containers_info(self, center_position: BlockPosition, max_count: int = 3) -> str:
         """获取附近容器信息的字符串表示"""
-        nearby_containers = self.get_nearby_containers(center_position)
+        nearby_containers = self.get_nearby_containers(center_position, max_count=max_count)
         if not nearby_containers:
             return ""
         
         info_lines = []
         
-        for container in nearby_containers[:max_count]:
+        for container in nearby_containers:
             pos = container.position
             container_type = "箱子" if container.container_type == "chest" else "熔炉"
             
-            # 构建容器信息行
-            container_line = f"- {container_type} at ({pos.x}, {pos.y}, {pos.z})"
-            
-            # 添加内容物信息
-            if container.container_type == "furnace" and container.furnace_slots:
-                # 熔炉特殊显示格式
-                input_items = []
-                fuel_items = []
-                output_items = []
-                
-                for slot_name, items in container.furnace_slots.items():
-                    for item_name, count in items.items():
-                        if count > 0:
-                            item_str = f"{item_name} x{count}"
-                            if slot_name == "input":
-                                input_items.append(item_str)
-                            elif slot_name == "fuel":
-                                fuel_items.append(item_str)
-                            elif slot_name == "output":
-                                output_items.append(item_str)
-                
-                slot_info = []
-                if input_items:
-                    slot_info.append(f"输入: {', '.join(input_items)}")
-                if fuel_items:
-                    slot_info.append(f"燃料: {', '.join(fuel_items)}")
-                if output_items:
-                    slot_info.append(f"输出: {', '.join(output_items)}")
-                
-                if slot_info:
-                    container_line += f" [{'; '.join(slot_info)}]"
-                else:
-                    container_line += " [空]"
-            else:
-                # 普通容器显示格式
-                if container.inventory:
-                    items = []
-                    for item_name, count in container.inventory.items():
-                        if count > 0:
-                            items.append(f"{item_name} x{count}")
-                    if items:
-                        container_line += f" [{', '.join(items)}]"
-                    else:
-                        container_line += " [空]"
-                else:
-                    container_line += " [空]"
-            
-            info_lines.append(container_line)
+            # 构建容器信息行（一次格式化完成，不做多次字符串拼接）
+            contents = _format_container_contents(container)
+            info_lines.append(f"- {container_type} at ({pos.x}, {pos.y}, {pos.z}){contents}")
         
         return "\n".join(info_lines)
+
+
+def _format_container_contents(container: ContainerInfo) -> str:
+    """生成容器内容物的 " [...]" 描述后缀"""
+    if container.container_type == "furnace" and container.furnace_slots:
+        # 熔炉特殊显示格式
+        slots = container.furnace_slots
+        input_items = [f"{name} x{count}" for name, count in slots.get("input", {}).items()]
+        fuel_items = [f"{name} x{count}" for name, count in slots.get("fuel", {}).items()]
+        output_items = [f"{name} x{count}" for name, count in slots.get("output", {}).items()]
+        
+        slot_info = [
+            f"{label}: {', '.join(items)}"
+            for label, items in (("输入", input_items), ("燃料", fuel_items), ("输出", output_items))
+            if items
+        ]
+        return f" [{'; '.join(slot_info)}]" if slot_info else " [空]"
     
+    # 普通容器显示格式（缓存中只保存数量大于 0 的物品）
+    items = [f"{name} x{count}" for name, count in container.inventory.items()]
+    return f" [{', '.join(items)}]" if items else " [空]"
+
 
+@functools.lru_cache(maxsize=1)
+def get_global_container_cache() -> GlobalContainerCache:
+    """获取全局容器缓存实例（首次使用时才创建并加载缓存文件）"""
+    return GlobalContainerCache()
+
+
+class _LazyContainerCacheProxy:
+    """全局实例的延迟代理，保持 global_container_cache.xxx 的旧用法不变"""
+    
+    def __getattr__(self, name: str):
+        return getattr(get_global_container_cache(), name)
 
 
-# 创建全局实例
-global_container_cache = GlobalContainerCache()
\ No newline at end of file
+# 全局实例（延迟创建，导入模块时不读取缓存文件）
+global_container_cache = _LazyContainerCacheProxy()
\ No newline at end of file
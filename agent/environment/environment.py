@@ -3,13 +3,17 @@ Minecraft环境信息存储类
 用于存储和管理游戏环境数据
 """
 
+import io
+import time
+from functools import lru_cache, partial
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import numpy as np
 from utils.logger import get_logger
-from agent.common.basic_class import Player, Position, Entity, BlockPosition
+from agent.common.basic_class import Player, Position, Entity, BlockPosition, _intern
 from agent.events import EventType, BaseEvent
 from agent.block_cache.block_cache import global_block_cache
-from openai_client.llm_request import LLMClient
 from agent.environment.locations import global_location_points
 from config import global_config
 from agent.thinking_log import global_thinking_log
@@ -19,7 +23,6 @@ from agent.to_do_list import mai_goal, mai_to_do_list
 from agent.utils.utils import format_task_done_list
 from agent.prompt_manager.prompt_manager import prompt_manager
 from agent.container_cache.container_cache import global_container_cache
-from openai_client.modelconfig import ModelConfig
 from agent.chat_history import global_chat_history
 from agent.environment.inventory_utils import review_all_tools
 import traceback
@@ -30,11 +33,204 @@ import asyncio
 
 logger = get_logger("EnvironmentInfo")
 
+# 提示词中固定不变的文本行
+INVENTORY_FULL_LINE = "物品栏已满！无法装入新物品！\n"
+INVENTORY_EMPTY_LINE = "  物品栏为空\n"
+NO_CHAT_LINE = "暂无聊天记录"
+
+# 脚下方块描述的缓存有效期（秒）：方块缓存原地更新且没有变更通知，用短时效限制陈旧程度
+POSITION_STR_CACHE_TTL = 1.0
+
+# 视为"附近有生物"的实体类型
+MOB_NEARBY_TYPES = ("player", "animal")
+
+# 在线玩家列表只提供名称，没有UUID、ping和游戏模式信息，其余字段使用固定默认值
+_make_online_player = partial(Player, uuid="", ping=0, gamemode=0)
+
+@lru_cache(maxsize=4096)
+def _shared_position(x: float, y: float, z: float) -> Position:
+    """按坐标复用 Position 实例：静止的玩家和实体在连续的tick中坐标完全相同，无需重复创建对象
+
+    返回的实例会被共享，调用方不能修改其坐标
+    """
+    return Position(x, y, z)
+
+
+def _entity_status(entity_data: Dict[str, Any]) -> tuple:
+    """解析实体的 (距离, 生命值, 最大生命值)，缺失的字段为 None"""
+    distance = entity_data.get("distance")
+    health = entity_data.get("health")
+    max_health = entity_data.get("maxHealth")
+    return (
+        float(distance) if distance is not None else None,
+        int(health) if health is not None else None,
+        int(max_health) if max_health is not None else None,
+    )
+
+
+def _build_player_entity(entity_data: Dict[str, Any], entity_type: str, entity_name: str, position: Position) -> Entity:
+    distance, health, max_health = _entity_status(entity_data)
+    return PlayerEntity(
+        type=entity_type,
+        name=entity_name,
+        username=entity_data.get("username"),
+        position=position,
+        distance=distance,
+        health=health,
+        max_health=max_health
+    )
+
+
+def _build_animal_entity(entity_data: Dict[str, Any], entity_type: str, entity_name: str, position: Position) -> Entity:
+    distance, health, max_health = _entity_status(entity_data)
+    return AnimalEntity(
+        type=entity_type,
+        name=entity_name,
+        position=position,
+        distance=distance,
+        health=health,
+        max_health=max_health
+    )
+
+
+def _build_item_entity(entity_data: Dict[str, Any], entity_type: str, entity_name: str, position: Position) -> Entity:
+    item_info = entity_data.get("itemsInfo", [])[0]
+    return ItemEntity(
+        type=entity_type,
+        name=entity_name,
+        item_name=item_info.get("name"),
+        count=item_info.get("count", 1),
+        position=position,
+    )
+
+
+def _build_generic_entity(entity_data: Dict[str, Any], entity_type: str, entity_name: str, position: Position) -> Entity:
+    distance, health, max_health = _entity_status(entity_data)
+    return Entity(
+        type=entity_type,
+        name=entity_name,
+        position=position,
+        distance=distance,
+        health=health,
+        max_health=max_health
+    )
+
+
+# 实体类型 -> 构造函数；其余类型中名称为 item 的是掉落物，其他按普通实体构造
+_ENTITY_BUILDERS = {
+    "player": _build_player_entity,
+    "animal": _build_animal_entity,
+}
+
+
+# 物品栏排序键：入库时每个槽位都已标准化为带 int 类型 slot 的字典
+_slot_key = itemgetter('slot')
+
+# 位置/速度数据的坐标取值（已确认三个键都存在时使用）
+_xyz_values = itemgetter('x', 'y', 'z')
+
+# 空字典哨兵，嵌套字段缺失时复用，避免每次创建默认值
+_EMPTY: Dict[str, Any] = {}
+
+# 观察数据字段表：(属性名, 顶层键, 嵌套键, 默认值)，嵌套键为 None 表示直接取顶层值
+# 游戏状态字段（来自 query_game_state），在位置校验之前更新
+_GAME_STATE_FIELDS = (
+    ("weather", "weather", None, ""),
+    ("time_of_day", "timeOfDay", None, 0),
+    ("dimension", "dimension", None, ""),
+    ("biome", "biome", None, ""),
+    ("player_name", "username", None, ""),
+    ("gamemode", "gamemode", None, ""),
+)
+# 取值范围很小、每个tick都会重新赋值的名称类字段，驻留后同值共享同一字符串对象
+_INTERNED_FIELDS = frozenset({"weather", "dimension", "biome", "player_name", "gamemode"})
+
+# 玩家状态字段（来自 query_player_status），在位置校验通过后更新
+_PLAYER_STATUS_FIELDS = (
+    ("health_max", "health", "max", 20),
+    ("health_percentage", "health", "percentage", 0),
+    ("food", "food", "current", 0),
+    ("food_max", "food", "max", 20),
+    ("food_saturation", "food", "saturation", 0),
+    ("food_percentage", "food", "percentage", 0),
+    ("experience", "experience", "points", 0),
+    ("level", "experience", "level", 0),
+    ("oxygen", "oxygen", None, 0),
+    ("armor", "armor", None, 0),
+    ("is_sleeping", "isSleeping", None, False),
+    ("on_ground", "onGround", None, True),
+    ("yaw", "yaw", None, None),
+    ("pitch", "pitch", None, None),
+    ("held_item", "heldItem", None, None),
+    ("using_held_item", "usingHeldItem", None, False),
+    ("occupied_slot_count", "inventory", "fullSlotCount", 0),
+    ("empty_slot_count", "inventory", "emptySlotCount", 0),
+    ("slot_count", "inventory", "slotCount", 0),
+)
+
+
+def _format_inventory_item(item: Dict[str, Any]) -> str:
+    """格式化单个物品栏槽位的显示行，item 为 update_from_observation 标准化后的字典"""
+    item_info = []
+    if item['name']:
+        item_info.append(item['name'])
+    if item['count'] > 0:
+        item_info.append(f"x{item['count']} ")
+    return f"  {' '.join(item_info)}\n"
+
+
+def _build_observation_unpacker(name: str, fields) -> Any:
+    """根据字段表生成直线赋值的解包函数，省去逐字段的 dict.get 方法查找"""
+    lines = [f"def {name}(self, d):", "    g = d.get"]
+    namespace: Dict[str, Any] = {"_EMPTY": _EMPTY, "_intern": _intern}
+    nested: Dict[str, str] = {}
+    for attr, key, sub_key, default in fields:
+        if sub_key is None:
+            if attr in _INTERNED_FIELDS:
+                lines.append(f"    self.{attr} = _intern(g({key!r}, {default!r}))")
+            else:
+                lines.append(f"    self.{attr} = g({key!r}, {default!r})")
+            continue
+        alias = nested.get(key)
+        if alias is None:
+            alias = nested[key] = f"n{len(nested)}"
+            lines.append(f"    {alias} = g({key!r}) or _EMPTY")
+        lines.append(f"    self.{attr} = {alias}.get({sub_key!r}, {default!r})")
+    exec("\n".join(lines), namespace)
+    return namespace[name]
+
 
 
 class EnvironmentInfo:
     """Minecraft环境信息存储类"""
     
+    # 属性固定，使用 __slots__ 省去实例字典，属性读写为固定偏移访问
+    __slots__ = (
+        # 玩家信息
+        "player_name", "gamemode",
+        # 位置、速度、光标和手持物品
+        "position", "block_position", "velocity",
+        "block_at_cursor", "entity_at_cursor", "held_item", "using_held_item",
+        "_held_item_cache_key", "_held_item_cache_text",
+        # 状态信息
+        "health", "health_max", "health_percentage", "last_health",
+        "food", "food_max", "food_saturation", "food_percentage",
+        "experience", "level", "oxygen", "armor", "is_sleeping", "on_ground",
+        "yaw", "pitch", "equipment",
+        # 视觉信息
+        "overview_base64", "overview_str", "_vlm",
+        # 物品栏
+        "inventory", "_inventory_lines", "_last_inventory_slots",
+        "occupied_slot_count", "empty_slot_count", "slot_count",
+        # 环境信息
+        "weather", "time_of_day", "dimension", "biome",
+        # 附近玩家、实体和事件
+        "nearby_players", "_online_player_map", "nearby_entities", "_entity_xyz", "_entity_types", "_has_mob", "_nearby_entities_str", "_last_entities_raw",
+        "recent_events", "_last_update_time",
+        # 位置描述缓存
+        "_position_str_key", "_position_str", "_position_str_time",
+    )
+    
     def __init__(self):
         # 玩家信息
         self.player_name: str = ""
@@ -52,6 +248,9 @@ class EnvironmentInfo:
         self.entity_at_cursor: Optional[Dict[str, Any]] = None  # 新增：光标指向的实体
         self.held_item: Optional[Dict[str, Any]] = None  # 新增：手持物品
         self.using_held_item: bool = False  # 新增：是否正在使用手持物品
+        # 手持物品描述缓存，物品未变化时直接复用
+        self._held_item_cache_key: Optional[tuple] = None
+        self._held_item_cache_text: str = ""
         
         # 状态信息
         self.health: int = 0
@@ -83,6 +282,8 @@ class EnvironmentInfo:
         
         # 物品栏
         self.inventory: List[Any] = []
+        self._inventory_lines: List[str] = []  # 与 inventory 一一对应的预格式化显示行
+        self._last_inventory_slots: Optional[List[Any]] = None  # 上一次的原始槽位数据，用于跳过未变化的更新
         
         self.occupied_slot_count: int = 0
         self.empty_slot_count: int = 0
@@ -96,30 +297,56 @@ class EnvironmentInfo:
         self.biome: str = ""  # 新增：生物群系
         
         # 附近玩家
-        # self.nearby_players: List[Player] = []
+        self.nearby_players: List[Player] = []
+        self._online_player_map: Dict[str, Player] = {}  # 玩家名 -> Player，在线名单变化时才增删对象
         
         # 附近实体
         self.nearby_entities: List[Entity] = []
+        # 附近实体坐标列 (N, 3)，与 nearby_entities 顺序一致，用于批量距离计算
+        self._entity_xyz: np.ndarray = np.empty((0, 3))
+        self._entity_types: np.ndarray = np.empty(0, dtype=str)  # 附近实体类型列，顺序同上
+        self._has_mob: bool = False  # 附近是否有玩家或动物，实体列表更新时计算
+        self._nearby_entities_str: Optional[str] = None  # 附近实体渲染结果缓存，实体列表更新时失效
+        self._last_entities_raw: Optional[List[Dict[str, Any]]] = None  # 上一次的原始实体数据，用于跳过未变化的更新
         
         
         # 最近事件
         self.recent_events: List[BaseEvent] = []
         
         
-        # 时间戳
-        self.last_update: Optional[datetime] = None
+        # 时间戳（每个tick只记录 time.time()，读取 last_update 时才转换为 datetime）
+        self._last_update_time: Optional[float] = None
+        
+        # 位置描述缓存：方块坐标未变且未过期时，跳过方块缓存查询
+        self._position_str_key: Optional[tuple] = None
+        self._position_str: str = ""
+        self._position_str_time: float = 0.0
         
+        # VLM 客户端，首次进行视觉分析时才创建
+        self._vlm = None
         
-        model_config = ModelConfig(
+    @property
+    def last_update(self) -> Optional[datetime]:
+        """最近一次观察数据更新的时间"""
+        if self._last_update_time is None:
+            return None
+        return datetime.fromtimestamp(self._last_update_time)
+    
+    @property
+    def vlm(self):
+        """VLM 客户端（延迟创建：不做视觉分析时不构造客户端，也不导入 openai）"""
+        if self._vlm is None:
+            from openai_client.llm_request import LLMClient
+            from openai_client.modelconfig import ModelConfig
+            model_config = ModelConfig(
                 model_name=global_config.vlm.model,
                 api_key=global_config.vlm.api_key,
                 base_url=global_config.vlm.base_url,
                 max_tokens=global_config.vlm.max_tokens,
                 temperature=global_config.vlm.temperature
             )
-            
-        self.vlm = LLMClient(model_config)
-        
+            self._vlm = LLMClient(model_config)
+        return self._vlm
         
     async def get_overview_str(self) -> str:
         if not self.vlm:
@@ -144,43 +371,34 @@ class EnvironmentInfo:
 
         
         # 更新游戏状态信息 (来自 query_game_state)
-        self.weather = data.get("weather", "")
-        self.time_of_day = data.get("timeOfDay", 0)
-        self.dimension = data.get("dimension", "")
-        self.biome = data.get("biome", "") # 更新生物群系
-        
-        self.player_name = data.get("username", "")
-        self.gamemode = data.get("gamemode", "") # 更新游戏模式
+        self._apply_game_state(data)
         
         # 更新在线玩家信息 (来自 query_game_state)
+        # 在线玩家只提供名称，创建基本的Player对象
+        # 名单未变化时沿用已有对象，变化时只为新上线的玩家创建对象
         online_players = data.get("onlinePlayers", [])
-        self.nearby_players = []
-        for player_name in online_players:
-            # 在线玩家只提供名称，创建基本的Player对象
-            player = Player(
-                uuid="",  # 在线玩家列表中没有UUID
-                username=player_name,
-                display_name=player_name,
-                ping=0,  # 在线玩家列表中没有ping信息
-                gamemode=0  # 在线玩家列表中没有游戏模式信息
-            )
-            self.nearby_players.append(player)
+        known_players = self._online_player_map
+        if list(known_players) != online_players:
+            current_players = {}
+            for name in online_players:
+                player = known_players.get(name)
+                if player is None:
+                    player = _make_online_player(username=name, display_name=name)
+                current_players[name] = player
+            self._online_player_map = current_players
+            self.nearby_players = list(current_players.values())
     
         
         # 更新位置信息
         pos_data = data.get("position")
-        logger.debug(f"[Environment] 位置数据检查: pos_data={pos_data}, type={type(pos_data)}")
+        # 每个tick都会执行，调试日志使用延迟格式化，未启用 DEBUG 时不格式化位置数据
+        logger.debug("[Environment] 位置数据检查: pos_data={}, type={}", pos_data, type(pos_data))
 
         if pos_data and isinstance(pos_data, dict):
-            logger.debug(f"[Environment] 位置数据验证: x={pos_data.get('x')}, y={pos_data.get('y')}, z={pos_data.get('z')}")
-            if all(k in pos_data for k in ['x', 'y', 'z']):
-                self.position = Position(
-                    x=pos_data.get("x", 0.0),
-                    y=pos_data.get("y", 0.0),
-                    z=pos_data.get("z", 0.0)
-                )
+            if "x" in pos_data and "y" in pos_data and "z" in pos_data:
+                self.position = _shared_position(*_xyz_values(pos_data))
                 global_movement.set_position(self.position)
-                logger.debug(f"[Environment] 位置更新成功: {self.position}")
+                logger.debug("[Environment] 位置更新成功: {}", self.position)
             else:
                 logger.warning(f"[Environment] 位置数据不完整，缺少字段: {list(pos_data.keys())}")
                 self.position = None
@@ -195,50 +413,23 @@ class EnvironmentInfo:
 
         # 只有当 position 有效时才创建 block_position
         if self.position is not None:
-            self.block_position = BlockPosition(self.position)
+            self.block_position = BlockPosition.get(self.position.x, self.position.y, self.position.z)
         
         # 更新速度信息
         velocity_data = data.get("velocity")
         if velocity_data:
-            self.velocity = Position(
-                x=velocity_data["x"],
-                y=velocity_data["y"],
-                z=velocity_data["z"]
-            )
+            self.velocity = _shared_position(*_xyz_values(velocity_data))
             # !似乎坏了，没数据
             # global_movement.set_velocity(self.velocity)
         
-        # 更新状态信息
-        health_data = data.get("health", {})
-        current_health = health_data.get("current", 0)
-        self.health_max = health_data.get("max", 20)
-        self.health_percentage = health_data.get("percentage", 0)
+        # 更新状态信息（生命值上限、饥饿、经验、护甲、视角、手持物品、物品栏统计等）
+        self._apply_observation(data)
 
         # 使用新的生命值状态管理统一更新生命值（当前+历史）
-        health_state_change = self.update_health_state(current_health)
-        
-        food_data = data.get("food", {})
-        self.food = food_data.get("current", 0)
-        self.food_max = food_data.get("max", 20)
-        self.food_saturation = food_data.get("saturation", 0)
-        self.food_percentage = food_data.get("percentage", 0)
-
-        experience_data = data.get("experience", {})
-        self.experience = experience_data.get("points", 0)
-        self.level = experience_data.get("level", 0)
-        
-        self.oxygen = data.get("oxygen", 0)
-        self.armor = data.get("armor", 0) # 更新护甲值
-        self.is_sleeping = data.get("isSleeping", False) # 更新睡眠状态
-        self.on_ground = data.get("onGround", True) # 更新是否在地面上
+        health_state_change = self.update_health_state((data.get("health") or _EMPTY).get("current", 0))
         
         global_movement.set_on_ground(self.on_ground)
         
-        # logger.info(f"data: {data}")
-        # 更新视角信息
-        self.yaw = data.get("yaw")
-        self.pitch = data.get("pitch")
-        
         # logger.info(f"yaw: {self.yaw}, pitch: {self.pitch}")
         
         # 缓存玩家位置和视角信息到方块缓存系统
@@ -256,10 +447,6 @@ class EnvironmentInfo:
         # 更新装备信息
         self.equipment = data.get("equipment", {})
         
-        # 更新手持物品信息
-        self.held_item = data.get("heldItem")
-        self.using_held_item = data.get("usingHeldItem", False)
-        
         # 更新光标指向的方块和实体
         self.block_at_cursor = data.get("blockAtCursor") or data.get("blockAtEntityCursor")
         self.entity_at_cursor = data.get("entityAtCursor")
@@ -267,119 +454,91 @@ class EnvironmentInfo:
         
         # 更新物品栏
         inventory_data = data.get("inventory", {})
-        self.inventory = [] 
 
         # 新格式：包含统计信息和槽位数据
         slots = inventory_data.get("slots", [])
-        if isinstance(slots, list):
-            for slot_data in slots:
-                if isinstance(slot_data, dict):
-                    # 构建标准化的物品信息
-                    item_info = {
-                        'slot': slot_data.get('slot', 0),
-                        'count': slot_data.get('count', 0),
-                        'name': slot_data.get('name', ''),
-                        'displayName': slot_data.get('name', '')  # 使用name作为displayName
-                    }
-                    self.inventory.append(item_info)
-        
-        # 记录物品栏统计信息
-        self.occupied_slot_count = inventory_data.get('fullSlotCount', 0)
-        self.empty_slot_count = inventory_data.get('emptySlotCount', 0)
-        self.slot_count = inventory_data.get('slotCount', 0)
+        # 槽位数据与上一次完全相同时（稳定状态下的大多数tick），跳过重建、排序和格式化
+        if slots != self._last_inventory_slots:
+            self._last_inventory_slots = slots
+            self.inventory = []
+            if isinstance(slots, list):
+                for slot_data in slots:
+                    if isinstance(slot_data, dict):
+                        # 构建标准化的物品信息
+                        item_info = {
+                            'slot': slot_data.get('slot', 0),
+                            'count': slot_data.get('count', 0),
+                            'name': slot_data.get('name', ''),
+                            'displayName': slot_data.get('name', '')  # 使用name作为displayName
+                        }
+                        self.inventory.append(item_info)
+            
+            # 入库时按槽位排序一次，并预先格式化每个槽位的显示文本，渲染时直接拼接
+            self.inventory.sort(key=_slot_key)
+            self._inventory_lines = [_format_inventory_item(item) for item in self.inventory]
         
         # 更新时间戳
         # global_movement.show_movement_info()
         
         
-        self.last_update = datetime.now()
+        self._last_update_time = time.time()
         
     def update_nearby_entities(self, entities_list: List[Dict[str, Any]]):
+        """按顺序为每条原始实体数据生成一个实体，不跳过任何条目；
+        _entity_xyz 和 get_entity_distances 的行与 entities_list 一一对应，威胁检测依赖这一点"""
+        # 实体数据与上一次完全相同时，保留已解析的实体和渲染缓存
+        if entities_list == self._last_entities_raw:
+            return
         self.nearby_entities = []
-        for entity_data in entities_list:
+        self._nearby_entities_str = None
+        # 一次性把全部实体位置 [x, y, z] 转换为坐标数组（None 转为 NaN 后置 0），同时作为批量距离计算的坐标列
+        entity_xyz = np.array([entity_data["position"] for entity_data in entities_list], dtype=np.float64).reshape(-1, 3)
+        np.nan_to_num(entity_xyz, copy=False)
+        for entity_data, xyz in zip(entities_list, entity_xyz.tolist()):
             # logger.info(entity_data)
-            # 解析位置 [x, y, z]
-            position = Position(0.0, 0.0, 0.0)
-            pos_data = entity_data["position"]
-            position = Position(
-                x=float(pos_data[0]) if pos_data[0] is not None else 0.0,
-                y=float(pos_data[1]) if pos_data[1] is not None else 0.0,
-                z=float(pos_data[2]) if pos_data[2] is not None else 0.0
-            )
+            position = _shared_position(*xyz)
             # 解析实体信息
-            entity_type = entity_data.get("type", "other")
-            entity_name = entity_data.get("name", "未知实体")
+            # 实体类型和名称取值有限，驻留后同名实体共享字符串，比较时可走指针相等
+            entity_type = _intern(entity_data.get("type", "other"))
+            entity_name = _intern(entity_data.get("name", "未知实体"))
             
-            # 特殊处理玩家实体
-            if entity_type == "player":
-                entity = PlayerEntity(
-                    type=entity_type,
-                    name=entity_name,
-                    username= entity_data.get("username"),
-                    position=position,
-                    distance=(float(entity_data.get("distance")) if entity_data.get("distance") is not None else None),
-                    health=(int(entity_data.get("health")) if entity_data.get("health") is not None else None),
-                    max_health=(int(entity_data.get("maxHealth")) if entity_data.get("maxHealth") is not None else None)
-                )
-            # 特殊处理物品实体
-            elif entity_type == "animal":
-                entity = AnimalEntity(
-                    type=entity_type,
-                    name=entity_name,
-                    position=position,
-                    distance=(float(entity_data.get("distance")) if entity_data.get("distance") is not None else None),
-                    health=(int(entity_data.get("health")) if entity_data.get("health") is not None else None),
-                    max_health=(int(entity_data.get("maxHealth")) if entity_data.get("maxHealth") is not None else None)
-                )
-            else:
-                if entity_name == "item":
-                    item_info = entity_data.get("itemsInfo", [])[0]
-                    item_name = item_info.get("name")
-                    item_count = item_info.get("count", 1)
-                    entity = ItemEntity(
-                        type=entity_type,
-                        name=entity_name,
-                        item_name=item_name,
-                        count=item_count,
-                        position=position,
-                    )
-                else:
-                    entity = Entity(
-                        type=entity_type,
-                        name=entity_name,
-                        position=position,
-                        distance=(float(entity_data.get("distance")) if entity_data.get("distance") is not None else None),
-                        health=(int(entity_data.get("health")) if entity_data.get("health") is not None else None),
-                        max_health=(int(entity_data.get("maxHealth")) if entity_data.get("maxHealth") is not None else None)
-                    )
+            # 按实体类型分派构造函数，玩家、动物以外的实体再按名称区分掉落物
+            builder = _ENTITY_BUILDERS.get(entity_type)
+            if builder is None:
+                builder = _build_item_entity if entity_name == "item" else _build_generic_entity
+            entity = builder(entity_data, entity_type, entity_name, position)
 
             self.nearby_entities.append(entity)
+        
+        self._entity_xyz = entity_xyz
+        self._entity_types = np.array([e.type for e in self.nearby_entities], dtype=str)
+        self._has_mob = bool(np.isin(self._entity_types, MOB_NEARBY_TYPES).any())
+        
+        # 全部解析成功后才记录，解析失败的数据下次会重新处理
+        self._last_entities_raw = entities_list
             
-    def mob_nearby(self):
-        for entity in self.nearby_entities:
-            if entity.type == "player" or entity.type == "animal":
-                return True
-        return False
+    def get_entity_distances(self) -> np.ndarray:
+        """批量计算玩家到每个附近实体的距离，顺序与 nearby_entities 一致；位置未知时返回空数组"""
+        if self.position is None:
+            return np.empty(0)
+        offsets = self._entity_xyz - self.position.xyz
+        return np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+    
+    def mob_nearby(self) -> bool:
+        return self._has_mob
         
     def get_position_str(self) -> str:
         """获取位置信息"""
         if self.block_position:
-            block_on_feet_str = ""  # 初始化变量
-
-            block_feet = global_block_cache.get_block(self.block_position.x, self.block_position.y, self.block_position.z)
-            if block_feet:
-                if block_feet.block_type == "water":
-                    block_on_feet_str = f"注意：你正在水(x={self.block_position.x},y={self.block_position.y},z={self.block_position.z})中，可能会受到水流的影响"
-
-            block_on_feet = global_block_cache.get_block(self.block_position.x, self.block_position.y-1, self.block_position.z)
-            if block_on_feet:
-                block_on_feet_str = f"你正站在方块 {block_on_feet.block_type} (x={block_on_feet.position.x},y={block_on_feet.position.y},z={block_on_feet.position.z}) 的上方"
+            position_key = (self.block_position.x, self.block_position.y, self.block_position.z)
+            now = time.monotonic()
+            if position_key == self._position_str_key and now - self._position_str_time < POSITION_STR_CACHE_TTL:
+                position_str = self._position_str
             else:
-                block_on_feet_str = "注意：脚下没有方块，你可能在方块边缘或正在下坠"
-
-            position_str = f"""你现在的坐标(脚所在的坐标)是：x={self.block_position.x}, y={self.block_position.y}, z={self.block_position.z}
-{block_on_feet_str}
-            """
+                position_str = self._build_block_position_str()
+                self._position_str_key = position_key
+                self._position_str = position_str
+                self._position_str_time = now
         else:
             position_str = "位置信息不可用"
 
@@ -395,182 +554,147 @@ class EnvironmentInfo:
 
         return final_str
     
+    def _build_block_position_str(self) -> str:
+        """根据方块缓存生成当前坐标及脚下方块的描述"""
+        block_on_feet = global_block_cache.get_block(self.block_position.x, self.block_position.y-1, self.block_position.z)
+        if block_on_feet:
+            block_on_feet_str = f"你正站在方块 {block_on_feet.block_type} (x={block_on_feet.position.x},y={block_on_feet.position.y},z={block_on_feet.position.z}) 的上方"
+        else:
+            block_on_feet_str = "注意：脚下没有方块，你可能在方块边缘或正在下坠"
+
+        return f"""你现在的坐标(脚所在的坐标)是：x={self.block_position.x}, y={self.block_position.y}, z={self.block_position.z}
+{block_on_feet_str}
+            """
+    
     def get_self_info(self) -> str:
-        lines = []
-        
         # 玩家信息
-        if self.player_name:
-            lines.append(f"  用户名: {self.player_name}")
-            lines.append(f"  游戏模式: {self.gamemode}")
-            
-        return "\n".join(lines)
-            
+        if not self.player_name:
+            return ""
+        return f"  用户名: {self.player_name}\n  游戏模式: {self.gamemode}"
     
     def get_equipment_info(self) -> str:
-        lines = []
-        if self.equipment:
-            equipped_items = []
-            for slot, item in self.equipment.items():
-                if item:
-                    item_name = item.get("name", "未知物品")
-                    equipped_items.append(f"{slot}: {item_name}")
-            if equipped_items:
-                lines.append(f"  装备: {', '.join(equipped_items)}")
-                lines.append(f"  护甲值: {self.armor}")
-        return "\n".join(lines)
+        if not self.equipment:
+            return ""
+        equipped_items = [
+            f"{slot}: {item.get('name', '未知物品')}"
+            for slot, item in self.equipment.items() if item
+        ]
+        if not equipped_items:
+            return ""
+        return f"  装备: {', '.join(equipped_items)}\n  护甲值: {self.armor}"
     
     def get_held_item_info(self) -> str:
-        lines = []
-        if self.held_item:
-            item_name = self.held_item.get("name", "未知物品")
-            item_count = self.held_item.get("count", 1)
-            durability = self.held_item.get("maxDurability", 0)
-            current_damage = 0
-            if self.held_item.get("components"):
-                for component in self.held_item["components"]:
-                    if component.get("type") == "damage":
-                        current_damage = component.get("data", 0)
-                        break
-            lines.append(f"  手持物品: {item_name} x{item_count}")
-            if durability > 1:
-                remaining_durability = durability - current_damage
-                lines.append(f"    耐久度: {remaining_durability}/{durability}")
-            if self.using_held_item:
-                lines.append("    正在使用中")
-            
-        return "\n".join(lines)
+        held_item = self.held_item
+        if not held_item:
+            return ""
+        components = held_item.get("components") or ()
+        cache_key = (
+            held_item.get("name"), held_item.get("count"), held_item.get("maxDurability"),
+            tuple((c.get("type"), c.get("data")) for c in components),
+            self.using_held_item,
+        )
+        if cache_key == self._held_item_cache_key:
+            return self._held_item_cache_text
+        
+        item_name = held_item.get("name", "未知物品")
+        item_count = held_item.get("count", 1)
+        durability = held_item.get("maxDurability", 0)
+        current_damage = next((c.get("data", 0) for c in components if c.get("type") == "damage"), 0)
+        durability_line = f"\n    耐久度: {durability - current_damage}/{durability}" if durability > 1 else ""
+        using_line = "\n    正在使用中" if self.using_held_item else ""
+        text = f"  手持物品: {item_name} x{item_count}{durability_line}{using_line}"
+        self._held_item_cache_key = cache_key
+        self._held_item_cache_text = text
+        return text
     
     def get_inventory_info(self) -> str:
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
         if self.inventory:
             if self.empty_slot_count == 0:
-                lines.append("物品栏已满！无法装入新物品！")
+                w(INVENTORY_FULL_LINE)
             else:
-                lines.append(f"物品栏有{self.empty_slot_count}个空槽位")
-            # 按槽位排序显示物品
-            sorted_inventory = sorted(self.inventory, key=lambda x: x.get('slot', 0) if isinstance(x, dict) else 0)
-            
-            for item in sorted_inventory:
-                # 构建更可读的物品信息
-                item_info = []
-                
-                # 添加类型检查，确保item是字典类型
-                if isinstance(item, dict):
-                    if 'name' in item and item['name']:
-                        item_info.append(item['name'])
-                    if 'count' in item and item['count'] > 0:
-                        item_info.append(f"x{item['count']} ")
-                elif isinstance(item, str):
-                    # 如果item是字符串，直接显示
-                    item_info.append(item)
-                else:
-                    # 其他类型，转换为字符串显示
-                    item_info.append(str(item))
-                
-                # 组合物品信息
-                item_str = " ".join(item_info)
-                lines.append(f"  {item_str}")
+                w(f"物品栏有{self.empty_slot_count}个空槽位\n")
+            # inventory 已在入库时按槽位排序并预格式化
+            w("".join(self._inventory_lines))
                 
-            tool_tip_str = review_all_tools(self.inventory)
-            lines.append(tool_tip_str)
+            w(review_all_tools(self.inventory))
+            w("\n")
                 
         else:
-            lines.append("  物品栏为空")
-        lines.append("")
-        return "\n".join(lines)
+            w(INVENTORY_EMPTY_LINE)
+        return buf.getvalue()
     
     def get_nearby_entities_info(self) -> str:
-        lines = []
         # if self.nearby_players:
         #     lines.append("附近玩家:")
         #     for i, player in enumerate(self.nearby_players, 1):
         #         lines.append(f"  {i}. {player.display_name} ({player.username})")
         #         # lines.append(f"     延迟: {player.ping}ms, 游戏模式: {player.gamemode}")
         
-        if self.nearby_entities:
-            # logger.info(f"附近实体: {self.nearby_entities}")
-            lines.append(f" 附近实体数量: {len(self.nearby_entities)}")
-            for i, entity in enumerate(self.nearby_entities, 1):
-                # 物品实体显示名称和坐标
-                lines.append(f"  {i}. {entity.__str__()}")
-                
-        return "\n".join(lines)
+        if not self.nearby_entities:
+            return ""
+        
+        # 同一批实体在下次更新前可能被多次渲染（决策、聊天、受伤响应），整段结果只格式化一次
+        if self._nearby_entities_str is not None:
+            return self._nearby_entities_str
+        
+        # logger.info(f"附近实体: {self.nearby_entities}")
+        self._nearby_entities_str = f" 附近实体数量: {len(self.nearby_entities)}" + "".join(
+            f"\n  {i}. {entity}" for i, entity in enumerate(self.nearby_entities, 1)
+        )
+        return self._nearby_entities_str
     
     def get_self_status_info(self) -> str:
-        lines = []
-        lines.append(f"  生命值: {self.health}/{self.health_max}")
-        
-        if self.food/self.food_max < 0.5:
-            lines.append(f"  饥饿值: {self.food}/{self.food_max}，饥饿值较低，需要马上食用食物")
-        elif self.food/self.food_max < 0.8:
-            lines.append(f"  饥饿值: {self.food}/{self.food_max}，有条件最好食用食物")
+        food_ratio = self.food / self.food_max
+        if food_ratio < 0.5:
+            food_hint = "，饥饿值较低，需要马上食用食物"
+        elif food_ratio < 0.8:
+            food_hint = "，有条件最好食用食物"
         else:
-            lines.append(f"  饥饿值: {self.food}/{self.food_max}")
-            
-        lines.append(f"  等级: {self.level}")
-        return "\n".join(lines)
+            food_hint = ""
+        return (
+            f"  生命值: {self.health}/{self.health_max}\n"
+            f"  饥饿值: {self.food}/{self.food_max}{food_hint}\n"
+            f"  等级: {self.level}"
+        )
 
     def get_visual_info(self) -> str:
         """以可读文本形式返回所有环境信息"""
-        lines = []
         if self.overview_str:
-            lines.append("【周围环境鸟瞰】")
-            lines.append(self.overview_str)
-            lines.append("")
-        
-        lines.append("=" * 10)
-        
-        return "\n".join(lines)
+            return f"【周围环境鸟瞰】\n{self.overview_str}\n\n{'=' * 10}"
+        return "=" * 10
     
     
     def get_chat_str(self) -> str:
         """获取所有聊天事件的字符串表示"""
-        lines = []
-        
         # 从event_store获取聊天事件
         
-        chat_events: List[ChatEvent] = global_event_store.get_events_by_type(EventType.CHAT.value, 50)
-        
-        if not chat_events:
-            lines.append("暂无聊天记录")
-            return "\n".join(lines)
-        
-        # 按时间戳排序（从旧到新）
-        sorted_chat_events = sorted(chat_events, key=lambda x: x.timestamp)
-        
-        # 限制显示的聊天数量，避免信息过多
+        # 聊天事件按到达顺序（从旧到新）维护，限制显示的聊天数量，避免信息过多
         max_chats = 30
-        chats_to_show = sorted_chat_events[-max_chats:] if len(sorted_chat_events) > max_chats else sorted_chat_events
+        chats_to_show: List[ChatEvent] = global_event_store.get_events_by_type(EventType.CHAT.value, max_chats)
         
-        # lines.append(f"最近 {len(chats_to_show)} 条聊天记录 (总计: {len(chat_events)} 条):")
+        if not chats_to_show:
+            return NO_CHAT_LINE
         
-        # 重新编号，确保最新的聊天记录在最下方且编号连续
-        for i, event in enumerate(chats_to_show, 1):
+        # 每条聊天一行，最后一次性拼接（最新的聊天记录在最下方）
+        lines = []
+        append = lines.append
+        for event in chats_to_show:
             # 格式化时间戳
             timestamp_str = ""
             if event.timestamp:
-                from datetime import datetime
                 try:
-                    # 使用事件对象的时间戳方法
-                    dt = event.get_datetime()
-                    timestamp_str = f"[{dt.strftime('%H:%M:%S')}]"
-                except (ValueError, OSError):
+                    # 使用事件对象缓存的显示时间
+                    timestamp_str = f"[{event.get_display_time()}]"
+                except (ValueError, OSError, OverflowError):
                     timestamp_str = f"[{event.timestamp:.1f}s]"
             
-            # 获取聊天内容
-            chat_content = ""
-            if event.data.message:
-                chat_content = event.data.message
-            else:
-                chat_content = "未知内容"
-            
-            # 获取玩家名称
+            # 聊天内容与玩家名称，缺失时使用占位文本
+            chat_content = event.data.message or "未知内容"
             player_name = event.player_name or "未知玩家"
             
-            # 构建聊天行
-            # chat_line = f"  {i}. {timestamp_str} {player_name}: {chat_content}"
-            chat_line = f"{timestamp_str}{player_name}: {chat_content}"
-            lines.append(chat_line)
+            append(f"{timestamp_str}{player_name}: {chat_content}")
         
         return "\n".join(lines)
     
@@ -593,8 +717,20 @@ class EnvironmentInfo:
             logger.error(f"❌ 方块查询异常: {e}")
             return f"方块查询失败: {str(e)}"
 
+    def prefetch_nearby_blocks(self) -> "asyncio.Task[str]":
+        """
+        提前启动附近方块查询（在线程池中执行），返回的任务可传给 get_all_data，
+        使方块查询与视觉分析等其他等待并行进行
+        """
+        return asyncio.create_task(self._get_nearby_blocks_with_timeout())
     
-    async def get_all_data(self) -> dict:
+    async def get_all_data(self, nearby_blocks_task: Optional["asyncio.Task[str]"] = None) -> dict:
+        # 已提前启动的方块查询直接等待其结果，否则现在查询
+        if nearby_blocks_task is not None:
+            nearby_block_info = await nearby_blocks_task
+        else:
+            nearby_block_info = await self._get_nearby_blocks_with_timeout()
+        
         if self.food/self.food_max < 0.8:
             eat_action = """**eat**
 食用某样物品回复饱食度
@@ -629,7 +765,7 @@ class EnvironmentInfo:
             "inventory_info": self.get_inventory_info(),
             "full_thinking_list": global_thinking_log.get_thinking_log_full(),
             "thinking_list": global_thinking_log.get_thinking_log(),
-            "nearby_block_info": await self._get_nearby_blocks_with_timeout(),
+            "nearby_block_info": nearby_block_info,
             "position": self.get_position_str(),
             "chat_str": global_chat_history.get_chat_history_str(),
             "to_do_list": mai_to_do_list.__str__(),
@@ -726,4 +862,7 @@ class EnvironmentInfo:
 
 
 # 全局环境信息实例
+EnvironmentInfo._apply_game_state = _build_observation_unpacker("_apply_game_state", _GAME_STATE_FIELDS)
+EnvironmentInfo._apply_observation = _build_observation_unpacker("_apply_observation", _PLAYER_STATUS_FIELDS)
+
 global_environment = EnvironmentInfo()
@@ -11,19 +11,25 @@ from typing import Optional, Dict, Any, Set
 from datetime import datetime
 from utils.logger import get_logger
 from agent.environment.environment import global_environment
-import json
+import numpy as np
 from agent.block_cache.block_cache import global_block_cache
 from agent.common.basic_class import Player, BlockPosition
-from agent.events import EventFactory, EventType, global_event_store, global_event_emitter
+from agent.events import BaseEvent, EventFactory, EventType, global_event_store, global_event_emitter
 from agent.thinking_log import global_thinking_log
 from mcp_server.client import global_mcp_client
 from agent.chat_history import global_chat_history
+from agent.utils.json_utils import json_loads
 from utils.logger import get_logger
 
 logger = get_logger("EnvironmentUpdater")   
+
+
 class EnvironmentUpdater:
     """环境信息定期更新器"""
     
+    # 不写入事件存储的事件类型（entityHurt事件现在被启用用于伤害响应处理，不再忽略）
+    IGNORED_EVENT_TYPES: frozenset = frozenset()
+    
     def __init__(self,update_interval: int = 0.1):
         """
         初始化环境更新器
@@ -58,6 +64,15 @@ class EnvironmentUpdater:
         # 威胁处理状态跟踪 - 避免反复中断攻击决策
         self.in_threat_alert_mode = False  # 是否处于威胁警戒状态
         self.threat_count = 0  # 当前威胁数量
+        self.threat_start_time: Optional[float] = None  # 进入警戒状态的时间
+
+        # 已见过的未注册事件类型，只在首次出现时记录日志
+        self._unregistered_event_types: Set[str] = set()
+
+        # 按事件类型分发的向后兼容硬编码处理，一次构建，避免每个事件逐个比较类型
+        self._event_handlers: Dict[str, Any] = {
+            EventType.CHAT.value: global_chat_history.add_chat_history,
+        }
         
     
     def start(self) -> bool:
@@ -180,15 +195,19 @@ class EnvironmentUpdater:
             hostile_mobs = []
             current_threat_count = 0
             if global_environment.position:
-                for entity_dict in nearby_entities:
+                # update_nearby_entities 对每条原始数据按顺序生成一个实体，不跳过任何条目，
+                # 因此距离数组与 nearby_entities 一一对应；距离一次性批量算出，
+                # 先按检测范围筛选，只对范围内的实体做敌对判断
+                distances = global_environment.get_entity_distances()
+                assert len(distances) == len(nearby_entities), "实体距离数组与 nearby_entities 长度不一致"
+                for index in np.flatnonzero(distances <= detection_range).tolist():
+                    entity_dict = nearby_entities[index]
                     if isinstance(entity_dict, dict) and self._is_hostile_entity(entity_dict):
                         # 转换为Entity对象
                         entity = self._create_entity_from_dict(entity_dict)
                         if entity and entity.position:
-                            distance = global_environment.position.distanceTo(entity.position)
-                            if distance <= detection_range:
-                                hostile_mobs.append((entity, distance))
-                                current_threat_count += 1
+                            hostile_mobs.append((entity, float(distances[index])))
+                            current_threat_count += 1
 
             self.logger.debug(f"[威胁检测] 检测到 {len(hostile_mobs)} 个需要攻击的生物在范围内")
             if hostile_mobs:
@@ -230,19 +249,17 @@ class EnvironmentUpdater:
             # 添加威胁状态超时重置机制（防止卡死）
             if self.in_threat_alert_mode:
                 # 记录威胁开始时间（如果还没记录）
-                if not hasattr(self, 'threat_start_time'):
+                if self.threat_start_time is None:
                     self.threat_start_time = time.time()
                 
                 # 如果威胁状态持续超过5分钟，强制重置
                 if time.time() - self.threat_start_time > 300:  # 5分钟
                     self.logger.warning(f"[威胁检测] ⏰ 威胁状态持续超过5分钟，强制重置")
                     self.reset_threat_alert_mode()
-                    if hasattr(self, 'threat_start_time'):
-                        delattr(self, 'threat_start_time')
+                    self.threat_start_time = None
             else:
                 # 清除威胁开始时间
-                if hasattr(self, 'threat_start_time'):
-                    delattr(self, 'threat_start_time')
+                self.threat_start_time = None
 
             # 执行攻击逻辑（在警戒状态下持续攻击）
             if hostile_mobs and self.in_threat_alert_mode:
@@ -305,9 +322,7 @@ class EnvironmentUpdater:
                     self.logger.info("[威胁检测] 🔴 已切换到威胁警戒模式，停止LLM决策")
 
         except Exception as e:
-            self.logger.error(f"[威胁检测] 检测和攻击过程中出错: {e}")
-            import traceback
-            self.logger.error(f"[威胁检测] 异常详情: {traceback.format_exc()}")
+            self.logger.opt(exception=True).error("[威胁检测] 检测和攻击过程中出错: {}", e)
 
     def reset_threat_alert_mode(self):
         """重置威胁警戒状态 - 用于外部干预或状态清理"""
@@ -392,14 +407,18 @@ class EnvironmentUpdater:
                 max_health=(int(entity_data.get("maxHealth")) if entity_data.get("maxHealth") is not None else None)
             )
 
-            # 设置实体ID（如果有的话）
-            if "id" in entity_data:
-                entity.id = entity_data["id"]
+            # 设置实体ID（如果有的话），直接尝试整数转换，非数字ID记为 0
+            raw_id = entity_data.get("id")
+            if raw_id is not None:
+                try:
+                    entity.id = int(raw_id)
+                except (TypeError, ValueError):
+                    entity.id = 0
 
             return entity
 
         except Exception as e:
-            self.logger.error(f"创建Entity对象时出错: {e}")
+            self.logger.error("创建Entity对象时出错: {}", e)
             return None
 
     async def update_events(self):
@@ -415,6 +434,9 @@ class EnvironmentUpdater:
             # 每次获取后都更新 last_processed_tick 为最新事件的 gameTick
             self.last_processed_tick = max_tick + 1
             
+            ignored_types = self.IGNORED_EVENT_TYPES
+            event_handlers = self._event_handlers
+            unregistered_types = self._unregistered_event_types
             for event_data_item in new_events:
                 try:
                     # 使用EventFactory从原始数据创建事件对象
@@ -422,11 +444,14 @@ class EnvironmentUpdater:
 
                     # logger.info(event_data_item)
 
-                    # 注意：entityHurt事件现在被启用用于伤害响应处理
-                    ignore_event_name = []  # 不再忽略entityHurt事件
-                    if event.type in ignore_event_name:
+                    if event.type in ignored_types:
                         continue
 
+                    # 未注册的事件类型回退为 BaseEvent，首次出现时记录一次
+                    if type(event) is BaseEvent and event.type not in unregistered_types:
+                        unregistered_types.add(event.type)
+                        self.logger.debug("[EnvironmentUpdater] 未注册的事件类型: {}", event.type)
+
                     # 使用统一的事件存储
                     global_event_store.add_event(event)
 
@@ -434,13 +459,16 @@ class EnvironmentUpdater:
                     await global_event_emitter.emit(event)
 
                     # 保留：向后兼容的硬编码处理
-                    if event.type == EventType.CHAT.value:
-                        global_chat_history.add_chat_history(event)
+                    handler = event_handlers.get(event.type)
+                    if handler is not None:
+                        handler(event)
 
 
                 except Exception as e:
-                    self.logger.error(f"[EnvironmentUpdater] 处理事件失败: {e}")
-                    self.logger.error(f"事件数据: {event_data_item}")
+                    # 事件数据和堆栈只在日志实际输出时格式化
+                    self.logger.opt(exception=True).error(
+                        "[EnvironmentUpdater] 处理事件失败: {}，事件数据: {}", e, event_data_item
+                    )
                     continue
 
                     
@@ -555,7 +583,7 @@ class EnvironmentUpdater:
             result = await global_mcp_client.call_tool_directly(tool_name, params)
             if not result.is_error and result.content:
                 content_text = result.content[0].text
-                return json.loads(content_text)
+                return json_loads(content_text)
             else:
                 self.logger.error(f"[EnvironmentUpdater] {tool_name}调用失败: {result.content[0].text if result.content else 'Unknown error'}")
                 return None
@@ -626,7 +654,7 @@ class EnvironmentUpdater:
                 positions_with_data.add((x, y, z))
                 
                 # 获取或创建方块位置对象
-                block_pos = BlockPosition(x=x, y=y, z=z)
+                block_pos = BlockPosition.get(x, y, z)
                 
                 # 更新方块缓存，包括 can_see 信息
                 cached_block = global_block_cache.add_block(block_type, can_see, block_pos)
@@ -638,7 +666,7 @@ class EnvironmentUpdater:
                     for z in range(start_z, end_z + 1):
                         if (x, y, z) not in positions_with_data:
                             # 这个位置在查询范围内但没有数据，设置为air且can_see=True
-                            block_pos = BlockPosition(x=x, y=y, z=z)
+                            block_pos = BlockPosition.get(x, y, z)
                             cached_block = global_block_cache.add_block("air", True, block_pos)
                             updated_count += 1
             
@@ -79,9 +79,7 @@ def review_pickaxe(inventory:List[Item]) -> str:
         elif max_tool_material_level == 6:
             tool_tip_str = "背包中有一把netherite_pickaxe，能够开采所有石质方块\n"
     elif len(tool_list) > 1:
-        all_pickaxe_str = ""
-        for item in tool_list:
-            all_pickaxe_str += f"{item.tool_material}pickaxe, "
+        all_pickaxe_str = "".join(f"{item.tool_material}pickaxe, " for item in tool_list)
         all_pickaxe_str = f"背包中有:[{all_pickaxe_str}]"
         
         if max_tool_material_level == 1:
@@ -126,9 +124,7 @@ def review_axe(inventory:List[Item]) -> str:
         elif max_tool_material_level == 6:
             tool_tip_str = "背包中只有一把netherite_axe，可以极快速采集所有木质方块。\n"
     elif len(tool_list) > 1:
-        all_axe_str = ""
-        for item in tool_list:
-            all_axe_str += f"{item.tool_material}axe, "
+        all_axe_str = "".join(f"{item.tool_material}axe, " for item in tool_list)
         all_axe_str = f"背包中有:[{all_axe_str}]"
         
         if max_tool_material_level == 1:
@@ -174,9 +170,7 @@ def review_shovel(inventory:List[Item]) -> str:
         elif max_tool_material_level == 6:
             tool_tip_str = "背包中有一把netherite_shovel，可以极快速挖掘泥土，沙子或砂砾等方块\n"
     elif len(tool_list) > 1:
-        all_shovel_str = ""
-        for item in tool_list:
-            all_shovel_str += f"{item.tool_material}shovel, "
+        all_shovel_str = "".join(f"{item.tool_material}shovel, " for item in tool_list)
         all_shovel_str = f"背包中有:[{all_shovel_str}]"
         
         if max_tool_material_level == 1:
@@ -211,9 +205,7 @@ def review_hoe(inventory:List[Item]) -> str:
     if len(tool_list) == 0:
         tool_tip_str = "背包中没有锄头，如果想要farm，可以合成锄头\n"
     elif len(tool_list) > 1:
-        all_hoe_str = ""
-        for item in tool_list:
-            all_hoe_str += f"{item.tool_material}锄头, "
+        all_hoe_str = "".join(f"{item.tool_material}锄头, " for item in tool_list)
         all_hoe_str = f"背包中有:[{all_hoe_str}]，如果不需要进行farm，不要携带这么多锄头\n"
         tool_tip_str = all_hoe_str
     
@@ -246,9 +238,7 @@ def review_sword(inventory:List[Item]) -> str:
             tool_tip_str = "背包中有一把钻石剑，可以快速击杀怪物\n"
             
     elif len(tool_list) > 1:
-        all_sword_str = ""
-        for item in tool_list:
-            all_sword_str += f"{item.tool_material}剑, "
+        all_sword_str = "".join(f"{item.tool_material}剑, " for item in tool_list)
         all_sword_str = f"背包中有:[{all_sword_str}]，携带太多剑容易浪费背包空间，建议携带一把\n"
         
         if max_tool_material_level == 1:
@@ -1,11 +1,13 @@
 import json
 import os
-from typing import List
+from typing import List, Optional
 from agent.common.basic_class import BlockPosition
 
 class LocationPoints:
     def __init__(self):
         self.location_list:List[tuple[str, str, BlockPosition]] = []
+        # all_location_str 的结果缓存，坐标点增删改或重新加载时失效
+        self._location_str: Optional[str] = None
         self.data_file = "data/locations.json"
         # 确保data目录存在
         os.makedirs("data", exist_ok=True)
@@ -21,26 +23,31 @@ class LocationPoints:
                 index += 1
             final_name = f"{name}~{index}"
         self.location_list.append((final_name, info, position))
+        self._location_str = None
         # 保存到JSON文件
         self.save_to_json()
         return final_name
         
     def remove_location(self, name: str, position: BlockPosition = None):
         self.location_list = [location for location in self.location_list if location[0] != name and location[2] != position]
+        self._location_str = None
         # 保存到JSON文件
         self.save_to_json()
         
     def all_location_str(self) -> str:
-        if self.location_list:
-            return "\n".join([f"坐标点:(x={location[2].x},y={location[2].y},z={location[2].z}) [{location[0]}] {location[1]}" for location in self.location_list])
-        else:
-            return "未设置任何坐标点，可以进行设置"
+        if self._location_str is None:
+            if self.location_list:
+                self._location_str = "\n".join([f"坐标点:(x={location[2].x},y={location[2].y},z={location[2].z}) [{location[0]}] {location[1]}" for location in self.location_list])
+            else:
+                self._location_str = "未设置任何坐标点，可以进行设置"
+        return self._location_str
         
     def edit_location(self, name: str, info: str):
         for i, location in enumerate(self.location_list):
             if location[0] == name:
                 # 创建新的元组替换旧的元组
                 self.location_list[i] = (location[0], info, location[2])
+                self._location_str = None
                 # 保存到JSON文件
                 self.save_to_json()
                 return True
@@ -81,7 +88,7 @@ class LocationPoints:
                         name, info, position_data = item
                         if isinstance(position_data, dict):
                             # 如果是字典格式，转换为 BlockPosition 对象
-                            position = BlockPosition(position_data)
+                            position = BlockPosition.from_dict(position_data)
                         else:
                             position = position_data
                         converted_data.append((name, info, position))
@@ -89,5 +96,6 @@ class LocationPoints:
             except (json.JSONDecodeError, FileNotFoundError):
                 # 文件不存在或格式错误时，使用空列表
                 self.location_list = []
+            self._location_str = None
 
 global_location_points = LocationPoints()
\ No newline at end of file
@@ -61,15 +61,13 @@ class Movement:
         # *更新位置
         self.position = position
         
-        # *计算速率
-        self.position_speed = 0
-        for i in range(3):
-            self.position_speed += self.position_velocity.get_value(i) ** 2
-        self.position_speed = math.sqrt(self.position_speed)
+        # *计算速率（math.hypot 在 C 中完成平方和开方）
+        velocity = self.position_velocity
+        self.position_speed = math.hypot(velocity.x, velocity.y, velocity.z)
 
         # *计算垂直速度和水平速率
-        self.vertical_velocity = self.position_velocity.get_value(1)
-        self.horizontal_velocity = math.sqrt(self.position_velocity.get_value(0) ** 2 + self.position_velocity.get_value(2) ** 2)
+        self.vertical_velocity = velocity.y
+        self.horizontal_velocity = math.hypot(velocity.x, velocity.z)
 
         # !速度大于10,坠落
         if self.vertical_velocity < -13:
@@ -2,7 +2,8 @@
 事件基类定义
 """
 
-from typing import Dict, Any, Optional, Union, TypeVar, Generic
+import sys
+from typing import Dict, Any, Optional, Union, TypeVar, Generic, Tuple
 from typing_extensions import TypedDict
 from datetime import datetime
 from utils.timestamp_utils import (
@@ -10,6 +11,7 @@ from utils.timestamp_utils import (
     format_timestamp_for_display,
     convert_timestamp_for_datetime,
 )
+from agent.common.basic_class import Player, Entity, Position
 from .event_registry import event_registry
 
 
@@ -17,26 +19,29 @@ from .event_registry import event_registry
 class DataWrapper:
     """包装字典数据，支持属性访问语法，同时保持字典的所有功能"""
 
+    __slots__ = ("_data", "_converted")
+
     def __init__(self, data: Dict[str, Any]):
         self._data = data
+        # 已转换对象的缓存：同一字段多次访问（描述、序列化、监听器）只转换一次
+        self._converted: Dict[str, Any] = {}
 
     def __getattr__(self, name: str) -> Any:
         """支持属性访问：data.message，并自动转换字典数据为对象"""
         if name in self._data:
-            value = self._data[name]
-            return self._convert_value(value)
+            return self._get_converted(name)
         raise AttributeError(f"data has no attribute '{name}'")
 
     def __getitem__(self, key: str) -> Any:
         """支持字典访问：data["message"]"""
         if key in self._data:
-            value = self._data[key]
-            return self._convert_value(value)
+            return self._get_converted(key)
         return None
 
     def __setitem__(self, key: str, value: Any) -> None:
         """支持字典设置：data["message"] = value"""
         self._data[key] = value
+        self._converted.pop(key, None)
 
     def __contains__(self, key: str) -> bool:
         """支持in操作：key in data"""
@@ -46,9 +51,20 @@ class DataWrapper:
         """支持字典get方法：data.get("message", "default")"""
         value = self._data.get(key, default)
         if key in self._data and value != default:
-            return self._convert_value(value)
+            return self._get_converted(key)
         return value
 
+    def _get_converted(self, key: str) -> Any:
+        """获取字段的转换结果，字典字段的转换对象会被缓存"""
+        converted = self._converted
+        if key in converted:
+            return converted[key]
+        value = self._data[key]
+        if not isinstance(value, dict):
+            return value
+        result = converted[key] = self._convert_value(value)
+        return result
+
     def _convert_value(self, value: Any) -> Any:
         """自动转换字典数据为相应的对象"""
         if isinstance(value, dict):
@@ -81,9 +97,6 @@ class DataWrapper:
     def _convert_to_player(self, data: dict) -> Any:
         """转换为Player对象"""
         try:
-            # 使用绝对导入
-            from agent.common.basic_class import Player
-
             return Player.from_dict(data)
         except Exception:
             # 如果转换失败，返回原字典
@@ -92,9 +105,6 @@ class DataWrapper:
     def _convert_to_entity(self, data: dict) -> Any:
         """转换为Entity对象"""
         try:
-            # 使用绝对导入
-            from agent.common.basic_class import Entity
-
             return Entity.from_raw_entity(data)
         except Exception:
             # 如果转换失败，返回原字典
@@ -103,9 +113,6 @@ class DataWrapper:
     def _convert_to_position(self, data: dict) -> Any:
         """转换为Position对象"""
         try:
-            # 使用绝对导入
-            from agent.common.basic_class import Position
-
             return Position(x=data.get("x", 0), y=data.get("y", 0), z=data.get("z", 0))
         except Exception:
             # 如果转换失败，返回原字典
@@ -115,6 +122,10 @@ class DataWrapper:
         return repr(self._data)
 
 
+# 事件显示时间的默认格式
+DEFAULT_DISPLAY_FORMAT = "%H:%M:%S"
+
+
 # 泛型类型变量，用于事件数据类型
 T = TypeVar("T", bound=Dict[str, Any])
 
@@ -124,18 +135,36 @@ class BaseEvent(Generic[T]):
 
     # 子类需要定义的事件类型，由子类设置
     EVENT_TYPE: str = "unknown"
+    # 序列化时原样附加到顶层的数据字段，由子类设置，to_dict 按表逐个填入
+    DICT_FIELDS: Tuple[str, ...] = ()
+
+    # 事件数量多且属性固定，使用 __slots__ 省去实例字典（子类声明空的 __slots__）
+    __slots__ = (
+        "type", "gameTick", "_timestamp_ms", "_normalized_timestamp",
+        "data", "_display_time", "_description",
+    )
 
     def __init__(self, type: str, gameTick: int, timestamp: float, data: T = None):
         """自定义初始化方法，自动处理时间戳转换"""
-        self.type = type
+        # 驻留事件类型字符串：JSON解析出的类型串每次都是新对象，驻留后与
+        # EventType常量的比较和按类型的字典查找可以走指针相等的快速路径
+        self.type = sys.intern(type) if isinstance(type, str) else type
         self.gameTick = gameTick
         self._timestamp_ms = timestamp
         # 使用DataWrapper包装数据，支持属性访问和字典访问
         raw_data = data if data is not None else {}
+        # 顶层的玩家名同样驻留（如聊天事件的username），嵌套的玩家/实体名在转换对象时驻留
+        username = raw_data.get("username") if isinstance(raw_data, dict) else None
+        if isinstance(username, str):
+            raw_data["username"] = sys.intern(username)
         self.data = DataWrapper(raw_data)  # type: ignore
 
         # 自动标准化时间戳（一次性转换，提高效率）
         self._normalized_timestamp = normalize_timestamp(timestamp)
+        # 默认格式显示时间的缓存，事件入库后不再变化，首次渲染时计算
+        self._display_time: Optional[str] = None
+        # 事件描述缓存，首次使用时生成
+        self._description: Optional[str] = None
 
     @property
     def timestamp(self) -> float:
@@ -147,15 +176,20 @@ class BaseEvent(Generic[T]):
         """设置时间戳（自动标准化）"""
         self._timestamp_ms = value
         self._normalized_timestamp = normalize_timestamp(value)
+        self._display_time = None
 
     @property
     def timestamp_ms(self) -> float:
         """获取原始时间戳（毫秒级，用于序列化）"""
         return self._timestamp_ms
 
-    def get_display_time(self, format_str: str = "%H:%M:%S") -> str:
-        """获取格式化的时间显示字符串"""
-        return format_timestamp_for_display(self.timestamp, format_str)
+    def get_display_time(self, format_str: str = DEFAULT_DISPLAY_FORMAT) -> str:
+        """获取格式化的时间显示字符串（默认格式的结果会缓存在事件上）"""
+        if format_str != DEFAULT_DISPLAY_FORMAT:
+            return format_timestamp_for_display(self.timestamp, format_str)
+        if self._display_time is None:
+            self._display_time = format_timestamp_for_display(self.timestamp, format_str)
+        return self._display_time
 
     def get_datetime(self):
         """获取datetime对象（自动处理时间戳转换）"""
@@ -165,9 +199,16 @@ class BaseEvent(Generic[T]):
         """获取事件分类，子类应该重写此方法"""
         return "unknown"
 
+    @property
+    def description(self) -> str:
+        """事件描述（事件数据入库后不再变化，首次访问时生成并缓存）"""
+        if self._description is None:
+            self._description = self.get_description()
+        return self._description
+
     def to_context_string(self) -> str:
         """为AI提供上下文信息的字符串表示，由子类实现"""
-        return f"[{self.type}] {self.get_description()}"
+        return f"[{self.type}] {self.description}"
 
     def get_description(self) -> str:
         """子类实现具体的描述逻辑"""
@@ -176,13 +217,18 @@ class BaseEvent(Generic[T]):
     def to_dict(self) -> dict:
         """转换为字典格式（使用原始时间戳）"""
         # 返回原始字典格式，用于序列化
-        data_dict = self.data._data if isinstance(self.data, DataWrapper) else self.data
-        return {
+        data = self.data
+        data_dict = data._data if isinstance(data, DataWrapper) else data
+        result = {
             "type": self.type,
             "gameTick": self.gameTick,
             "timestamp": self.timestamp_ms,  # 使用原始毫秒级时间戳
             "data": data_dict,
         }
+        # 子类声明的字段总是写入顶层，值为 None 时同样保留该键
+        for key in self.DICT_FIELDS:
+            result[key] = data[key]
+        return result
 
     @classmethod
     def from_raw_data(cls, event_data_item: dict) -> "BaseEvent[T]":
@@ -197,7 +243,7 @@ class BaseEvent(Generic[T]):
 
     def __str__(self) -> str:
         """返回事件的字符串表示，保持与原Event类兼容"""
-        return self.get_description()
+        return self.description
 
 
 class EventFactory:
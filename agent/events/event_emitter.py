@@ -147,11 +147,12 @@ class EventEmitter:
                 )
         except Exception as e:
             self._stats["errors"] += 1
-            logger.error(f"事件监听器执行失败 [{listener.event_type}]: {e}")
-            logger.error(f"监听器ID: {listener.id}, 回调: {listener.callback}")
-            import traceback
-
-            logger.error(f"异常详情: {traceback.format_exc()}")
+            # 使用 %-style 参数，消息由日志器在输出时才格式化；exc_info 附带异常堆栈
+            logger.error(
+                "事件监听器执行失败 [%s]: %s，监听器ID: %s, 回调: %s",
+                listener.event_type, e, listener.id, listener.callback,
+                exc_info=True,
+            )
 
     def on(self, event_type: str, callback: Callable) -> ListenerHandle:
         """注册持续监听器"""
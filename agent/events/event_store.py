@@ -2,12 +2,38 @@
 GameEventStore - 统一的事件存储和访问管理
 """
 
-from typing import List
+from collections import deque
+from itertools import islice
+from typing import Deque, Iterable, List
 from datetime import datetime
 from .base_event import BaseEvent
 from .event_types import EventType
 
 
+# 游戏相关事件类型（死亡、实体、物品、玩家、天气、生成等），模块加载时构建一次
+GAME_EVENT_TYPES = frozenset({
+    EventType.DEATH.value,
+    EventType.ENTITY_DEAD.value,
+    EventType.ENTITY_HURT.value,
+    EventType.ITEM_DROP.value,
+    EventType.PLAYER_COLLECT.value,
+    EventType.PLAYER_JOINED.value,
+    EventType.PLAYER_LEFT.value,
+    EventType.RAIN.value,
+    EventType.SPAWN.value,
+    EventType.SPAWN_RESET.value,
+})
+
+
+def _tail(events: Iterable[BaseEvent], limit: int) -> List[BaseEvent]:
+    """从后往前取最近的 limit 个事件，保持时间顺序"""
+    if limit <= 0:
+        return []
+    result = list(islice(reversed(events), limit))
+    result.reverse()
+    return result
+
+
 class GameEventStore:
     """游戏事件统一存储管理器"""
 
@@ -18,23 +44,31 @@ class GameEventStore:
         Args:
             max_events: 最大存储事件数量，超过时自动清理旧事件
         """
-        self.events: List[BaseEvent] = []
+        # 定长双端队列，超过最大数量时自动丢弃最旧的事件，无需整体切片复制
+        self.events: Deque[BaseEvent] = deque(maxlen=max_events)
         self.max_events = max_events
+        # 聊天事件的实时索引，按到达顺序追加，查询聊天记录时无需扫描全部事件
+        # 与 events 保持同一保留窗口：聊天事件被挤出 events 时同步从索引中移除
+        self.chat_events: Deque[BaseEvent] = deque()
 
     def add_event(self, event: BaseEvent):
         """添加事件到存储"""
-        self.events.append(event)
-
-        # 如果超过最大数量，移除最旧的事件
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events :]
+        events = self.events
+        if events and len(events) == events.maxlen and events[0].type == EventType.CHAT.value:
+            # 即将被挤出的最旧事件是聊天事件，它必然也是索引中最旧的一条
+            self.chat_events.popleft()
+        events.append(event)
+        if event.type == EventType.CHAT.value:
+            self.chat_events.append(event)
 
     def get_recent_events(self, limit: int = 50) -> List[BaseEvent]:
         """获取最近的事件"""
-        return self.events[-limit:] if self.events else []
+        return _tail(self.events, limit)
 
     def get_events_by_type(self, event_type: str, limit: int = 50) -> List[BaseEvent]:
         """根据事件类型获取事件"""
+        if event_type == EventType.CHAT.value:
+            return _tail(self.chat_events, limit)
         filtered_events = [e for e in self.events if e.type == event_type]
         return filtered_events[-limit:] if filtered_events else []
 
@@ -48,24 +82,10 @@ class GameEventStore:
         Returns:
             游戏相关事件列表
         """
-        # 定义需要过滤的事件类型
-        target_event_types = {
-            EventType.DEATH.value,
-            EventType.ENTITY_DEAD.value,
-            EventType.ENTITY_HURT.value,
-            EventType.ITEM_DROP.value,
-            EventType.PLAYER_COLLECT.value,
-            EventType.PLAYER_JOINED.value,
-            EventType.PLAYER_LEFT.value,
-            EventType.RAIN.value,
-            EventType.SPAWN.value,
-            EventType.SPAWN_RESET.value
-        }
-
         # 过滤目标类型的事件
         game_events = [
             event for event in self.events
-            if event.type in target_event_types
+            if event.type in GAME_EVENT_TYPES
         ]
 
         # 返回最近的指定数量事件
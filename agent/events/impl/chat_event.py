@@ -20,6 +20,7 @@ class ChatEvent(BaseEvent[ChatEventData]):
     """聊天事件。仅当玩家公开聊天时才会发出。"""
 
     EVENT_TYPE = EventType.CHAT.value
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: ChatEventData = None
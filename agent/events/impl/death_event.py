@@ -15,6 +15,7 @@ class DeathEvent(BaseEvent[DeathEventData]):
     """bot死亡事件。当bot自身死亡时发出。"""
 
     EVENT_TYPE = EventType.DEATH.value
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: DeathEventData = None
@@ -17,6 +17,7 @@ class EntityDeadEvent(BaseEvent[EntityDeadEventData]):
     """实体死亡事件"""
 
     EVENT_TYPE = EventType.ENTITY_DEAD.value
+    __slots__ = ()
 
     def __init__(
         self,
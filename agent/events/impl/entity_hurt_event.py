@@ -18,6 +18,7 @@ class EntityHurtEvent(BaseEvent[EntityHurtEventData]):
     """实体受伤事件"""
 
     EVENT_TYPE = EventType.ENTITY_HURT.value
+    __slots__ = ()
 
     def __init__(
         self,
@@ -33,8 +34,9 @@ class EntityHurtEvent(BaseEvent[EntityHurtEventData]):
         if self.data.entity:
             target = self.data.entity.username or self.data.entity.name or "实体"
             source_desc = ""
-            if hasattr(self.data, 'source') and self.data.source:
-                source = self.data.source.username or self.data.source.name or "实体"
+            source_entity = self.data["source"]
+            if source_entity:
+                source = source_entity.username or source_entity.name or "实体"
                 source_desc = f"，伤害来源：{source}"
 
             return f"{target} 受到了伤害{source_desc}，当前生命值为 {self.data.entity.health}"
@@ -46,6 +48,7 @@ class EntityHurtEvent(BaseEvent[EntityHurtEventData]):
         result = super().to_dict()
         if self.data.entity:
             result["entity"] = self.data.entity.to_dict()
-        if hasattr(self.data, 'source') and self.data.source:
-            result["source"] = self.data.source.to_dict()
+        source_entity = self.data["source"]
+        if source_entity:
+            result["source"] = source_entity.to_dict()
         return result
@@ -16,6 +16,7 @@ class ForcedMoveEvent(BaseEvent[ForcedMoveEventData]):
     """强制移动事件。当玩家被强制移动（如传送）时发出。"""
 
     EVENT_TYPE = EventType.FORCED_MOVE.value
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: ForcedMoveEventData = None
@@ -18,6 +18,8 @@ class HealthEvent(BaseEvent[HealthEventData]):
     """健康事件。当bot的生命值、饱食度发生变化时发出。"""
 
     EVENT_TYPE = EventType.HEALTH.value
+    DICT_FIELDS = ("health", "food", "foodSaturation")
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: HealthEventData = None
@@ -26,31 +28,16 @@ class HealthEvent(BaseEvent[HealthEventData]):
         super().__init__(type, gameTick, timestamp, data)
 
     def get_description(self) -> str:
-        health_info = (
-            f"生命值: {self.data.health}" if self.data.health is not None else ""
-        )
-        food_info = f"饱食度: {self.data.food}" if self.data.food is not None else ""
-        saturation_info = (
-            f"饱和度: {self.data.foodSaturation}"
-            if self.data.foodSaturation is not None
-            else ""
-        )
-        info_parts = [
-            info for info in [health_info, food_info, saturation_info] if info
-        ]
-        status_text = (
-            f"状态更新 - {', '.join(info_parts)}" if info_parts else "状态更新"
-        )
-
-        return f"你的{status_text}"
-
-    def to_dict(self) -> dict:
-        result = super().to_dict()
-        result.update(
-            {
-                "health": self.data.health,
-                "food": self.data.food,
-                "foodSaturation": self.data.foodSaturation,
-            }
-        )
-        return result
+        # 每个字段只经 DataWrapper 读取一次，逐段拼接，不构造中间列表
+        data = self.data
+        health = data.health
+        food = data.food
+        saturation = data.foodSaturation
+
+        status = f"生命值: {health}" if health is not None else ""
+        if food is not None:
+            status = f"{status}, 饱食度: {food}" if status else f"饱食度: {food}"
+        if saturation is not None:
+            status = f"{status}, 饱和度: {saturation}" if status else f"饱和度: {saturation}"
+
+        return f"你的状态更新 - {status}" if status else "你的状态更新"
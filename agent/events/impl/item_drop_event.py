@@ -28,6 +28,8 @@ class ItemDropEvent(BaseEvent[ItemDropEventData]):
     """物品丢弃事件"""
 
     EVENT_TYPE = EventType.ITEM_DROP.value
+    DICT_FIELDS = ("dropped", "position")
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: ItemDropEventData = None
@@ -62,17 +64,6 @@ class ItemDropEvent(BaseEvent[ItemDropEventData]):
 
         return ", ".join(item_descriptions)
 
-    def to_dict(self) -> dict:
-        """转换为字典格式"""
-        result = super().to_dict()
-        result.update(
-            {
-                "dropped": self.data.dropped,
-                "position": self.data.position,
-            }
-        )
-        return result
-
     def get_drop_position(self) -> Optional[Position]:
         """获取物品丢弃的位置"""
         return self.data.position
@@ -17,6 +17,7 @@ class KickedEvent(BaseEvent[KickedEventData]):
     """bot被踢出事件。当bot被踢出服务器时发出。"""
 
     EVENT_TYPE = EventType.KICKED.value
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: KickedEventData = None
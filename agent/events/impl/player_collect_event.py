@@ -28,6 +28,7 @@ class PlayerCollectEvent(BaseEvent[PlayerCollectEventData]):
     """玩家收集事件"""
 
     EVENT_TYPE = EventType.PLAYER_COLLECT.value
+    __slots__ = ()
 
     def __init__(
         self,
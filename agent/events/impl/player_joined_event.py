@@ -16,6 +16,7 @@ class PlayerJoinedEvent(BaseEvent[PlayerJoinedEventData]):
     """玩家加入事件"""
 
     EVENT_TYPE = EventType.PLAYER_JOINED.value
+    __slots__ = ()
 
     def __init__(
         self,
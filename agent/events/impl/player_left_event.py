@@ -17,6 +17,7 @@ class PlayerLeftEvent(BaseEvent[PlayerLeftEventData]):
     """玩家离开事件"""
 
     EVENT_TYPE = EventType.PLAYER_LEFT.value
+    __slots__ = ()
 
     def __init__(
         self,
@@ -17,6 +17,7 @@ class RainEvent(BaseEvent[RainEventData]):
     """下雨事件"""
 
     EVENT_TYPE = EventType.RAIN.value
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: RainEventData = None
@@ -17,6 +17,7 @@ class SpawnEvent(BaseEvent[SpawnEventData]):
     """重生事件"""
 
     EVENT_TYPE = EventType.SPAWN.value
+    __slots__ = ()
 
     def __init__(
         self, type: str, gameTick: int, timestamp: float, data: SpawnEventData = None
@@ -17,6 +17,8 @@ class SpawnResetEvent(BaseEvent[SpawnResetEventData]):
     """重生点重置事件"""
 
     EVENT_TYPE = EventType.SPAWN_RESET.value
+    DICT_FIELDS = ("newSpawnPoint",)
+    __slots__ = ()
 
     def __init__(
         self,
@@ -30,8 +32,3 @@ class SpawnResetEvent(BaseEvent[SpawnResetEventData]):
 
     def get_description(self) -> str:
         return f"你的重生点已重置为{self.data.newSpawnPoint}"
-
-    def to_dict(self) -> dict:
-        result = super().to_dict()
-        result["newSpawnPoint"] = self.data.newSpawnPoint
-        return result
@@ -239,12 +239,17 @@ class MaiAgent:
             # 获取当前环境信息
             # await global_environment_updater.perform_update()
 
+            # 方块查询与截图的视觉分析互不依赖，先启动方块查询，与视觉分析并行
+            nearby_blocks_task = global_environment.prefetch_nearby_blocks()
+
             # 更新截图
             await self.update_overview()
 
             # 获取环境数据（带超时保护，主要针对方块查询）
             try:
-                input_data = await asyncio.wait_for(global_environment.get_all_data(), timeout=15.0)
+                input_data = await asyncio.wait_for(
+                    global_environment.get_all_data(nearby_blocks_task=nearby_blocks_task), timeout=15.0
+                )
             except asyncio.TimeoutError:
                 self.logger.warning("⏰ 获取环境数据超时（15秒），使用简化数据")
                 # 提供基本数据，跳过复杂的方块查询
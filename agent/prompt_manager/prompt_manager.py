@@ -17,11 +17,14 @@ class PromptTemplate:
     template: str
     description: str = ""
     parameters: List[str] = field(default_factory=list)
+    # 必需参数集合，注册时计算一次，生成提示词时直接做集合判断
+    _required: frozenset = field(default=frozenset(), init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """初始化后自动提取参数"""
         if not self.parameters:
             self.parameters = self._extract_parameters()
+        self._required = frozenset(self.parameters)
     
     def _extract_parameters(self) -> List[str]:
         """从模板中提取参数名"""
@@ -39,8 +42,12 @@ class PromptTemplate:
     
     def format(self, **kwargs) -> str:
         """格式化模板"""
+        return self.format_map(kwargs)
+    
+    def format_map(self, params: Dict[str, Any]) -> str:
+        """使用参数字典格式化模板（不再解包复制参数）"""
         try:
-            return self.template.format(**kwargs)
+            return self.template.format_map(params)
         except KeyError as e:
             missing_param = str(e).strip("'")
             raise ValueError(f"缺少必需参数: {missing_param}")
@@ -91,15 +98,15 @@ class PromptManager:
         if not template:
             raise ValueError(f"模板 '{template_name}' 不存在")
         
-        # 验证参数
-        missing_params = template.validate_parameters(kwargs)
-        if missing_params:
+        # 验证参数：参数齐全时只做一次集合判断，缺失时才逐个列出
+        if not template._required <= kwargs.keys():
+            missing_params = template.validate_parameters(kwargs)
             raise ValueError(f"缺少必需参数: {', '.join(missing_params)}")
         
         # 格式化模板
         try:
-            result = template.format(**kwargs)
-            self.logger.debug(f"成功生成提示词，模板: {template_name}")
+            result = template.format_map(kwargs)
+            self.logger.debug("成功生成提示词，模板: %s", template_name)
             return result
         except Exception as e:
             self.logger.error(f"生成提示词失败: {e}")
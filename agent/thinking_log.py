@@ -3,6 +3,7 @@ import os
 import time
 from typing import List
 from agent.events import global_event_store
+from utils.timestamp_utils import format_timestamp_for_display
 
 class ThinkingLog:
     """思考记录"""
@@ -52,7 +53,10 @@ class ThinkingLog:
         # 从event_store获取最新的游戏事件
         recent_events = global_event_store.get_game_events(20)
         for event in recent_events:
-            event_items.append((str(event), "event", event.timestamp))
+            description = str(event)
+            # 没有描述的事件不进入日志，避免拼接空行
+            if description:
+                event_items.append((description, "event", event.timestamp))
         
         # 按时间戳排序并获取最新记录
         thinking_items.sort(key=lambda x: x[2])
@@ -71,8 +75,8 @@ class ThinkingLog:
         all_items = latest_notice + latest_action + latest_thinking + latest_event
         all_items.sort(key=lambda x: x[2])  # 按时间戳排序
         
-        # 构建日志字符串
-        thinking_str = ""
+        # 构建日志字符串（逐行收集后一次拼接）
+        lines = []
         for item in all_items:
             # 处理时间戳格式转换（毫秒转秒）
             timestamp = item[2]
@@ -82,9 +86,9 @@ class ThinkingLog:
 
             time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
             log_content, log_type, _ = item
-            thinking_str += f"{time_str}:{log_content}\n"
+            lines.append(f"{time_str}:{log_content}\n")
 
-        return thinking_str
+        return "".join(lines)
 
 
     def get_thinking_log_full(self) -> str:
@@ -109,7 +113,10 @@ class ThinkingLog:
         # 从event_store获取更多的游戏事件
         recent_events = global_event_store.get_game_events(20)
         for event in recent_events:
-            event_items.append((str(event), "event", event.timestamp))
+            description = str(event)
+            # 没有描述的事件不进入日志，避免拼接空行
+            if description:
+                event_items.append((description, "event", event.timestamp))
         
         # 按时间戳排序并获取最新记录
         thinking_items.sort(key=lambda x: x[2])
@@ -128,16 +135,15 @@ class ThinkingLog:
         all_items = latest_notice + latest_action + latest_thinking + latest_event
         all_items.sort(key=lambda x: x[2])  # 按时间戳排序
 
-        # 构建日志字符串
-        thinking_str = ""
+        # 构建日志字符串（逐行收集后一次拼接）
+        # 使用统一的工具函数处理时间戳转换
+        lines = []
         for item in all_items:
-            # 使用统一的工具函数处理时间戳转换
-            from utils.timestamp_utils import format_timestamp_for_display
             time_str = format_timestamp_for_display(item[2])
             log_content, log_type, _ = item
-            thinking_str += f"{time_str}:{log_content}\n"
+            lines.append(f"{time_str}:{log_content}\n")
 
-        return thinking_str
+        return "".join(lines)
     
     def save_to_json(self) -> None:
         """保存思考记录到JSON文件"""
@@ -0,0 +1,30 @@
+"""
+JSON 序列化工具
+优先使用 orjson，未安装或解析失败时回退到标准库 json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节串"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(raw: Union[str, bytes]) -> Any:
+    """反序列化 JSON 文本或 UTF-8 字节串，orjson 失败时回退到标准库 json"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
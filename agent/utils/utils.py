@@ -1,5 +1,6 @@
 import json
 import math
+from collections import Counter
 from json_repair import repair_json
 from typing import List, Dict, Any
 from utils.logger import get_logger
@@ -57,7 +58,7 @@ def convert_mcp_tools_to_openai_format(mcp_tools) -> List[Dict[str, Any]]:
 
 def calculate_distance(position1: BlockPosition, position2: BlockPosition) -> float:
     """计算两个位置之间的距离"""
-    return math.sqrt((position1.x - position2.x)**2 + (position1.y - position2.y)**2 + (position1.z - position2.z)**2)
+    return math.hypot(position1.x - position2.x, position1.y - position2.y, position1.z - position2.z)
 
 
 def parse_tool_result(result: CallToolResult) -> tuple[bool, str]:
@@ -304,6 +305,28 @@ def parse_thinking_multiple(thinking: str) -> tuple[bool, str, list, str]:
     return success, thinking, json_objects, json_before
 
 
+def _index_inventory(inventory: List[Dict[str, Any]]):
+    """
+    建立 物品名称 -> {槽位: 数量} 的映射，并同步累计各物品总数
+    
+    Returns:
+        (映射, 各物品总数 Counter)
+    """
+    items: Dict[str, Dict[Any, Any]] = {}
+    totals: Counter = Counter()
+    for item in inventory:
+        if isinstance(item, dict) and 'name' in item and item['name']:
+            item_name = item['name']
+            slot = item.get('slot', 0)
+            count = item.get('count', 0)
+            slots = items.setdefault(item_name, {})
+            if slot in slots:
+                totals[item_name] -= slots[slot]
+            totals[item_name] += count
+            slots[slot] = count
+    return items, totals
+
+
 def compare_inventories(old_inventory: List[Dict[str, Any]], new_inventory: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     比较两个inventory的差异
@@ -321,113 +344,63 @@ def compare_inventories(old_inventory: List[Dict[str, Any]], new_inventory: List
             'summary': '差异摘要文本'
         }
     """
-    # 创建物品名称到物品信息的映射，用于快速查找
-    old_items = {}
-    new_items = {}
+    # 物品名称 -> {槽位: 数量} 的映射及各物品总数，内部只保存数量，结果字典仅在输出时构建
+    old_items, old_totals = _index_inventory(old_inventory)
+    new_items, new_totals = _index_inventory(new_inventory)
     
-    # 处理旧物品栏
-    for item in old_inventory:
-        if isinstance(item, dict) and 'name' in item and item['name']:
-            item_name = item['name']
-            if item_name not in old_items:
-                old_items[item_name] = []
-            old_items[item_name].append({
-                'name': item_name,
-                'count': item.get('count', 0),
-                'slot': item.get('slot', 0)
-            })
-    
-    # 处理新物品栏
-    for item in new_inventory:
-        if isinstance(item, dict) and 'name' in item and item['name']:
-            item_name = item['name']
-            if item_name not in new_items:
-                new_items[item_name] = []
-            new_items[item_name].append({
-                'name': item_name,
-                'count': item.get('count', 0),
-                'slot': item.get('slot', 0)
-            })
+    # 同名物品的总数净增/净减（Counter 减法只保留正差值）
+    net_added = new_totals - old_totals
+    net_removed = old_totals - new_totals
     
     added = []
     removed = []
     changed = []
     
     # 检查新增的物品
-    for item_name, new_item_list in new_items.items():
-        if item_name not in old_items:
+    for item_name, new_slots in new_items.items():
+        old_slots = old_items.get(item_name)
+        if old_slots is None:
             # 完全新增的物品
-            for new_item in new_item_list:
-                added.append(new_item.copy())
+            for slot, count in new_slots.items():
+                added.append({'name': item_name, 'count': count, 'slot': slot})
         else:
-            # 检查数量变化
-            old_item_list = old_items[item_name]
-            
             # 简单的数量比较（假设相同名称的物品数量变化）
-            old_total_count = sum(item['count'] for item in old_item_list)
-            new_total_count = sum(item['count'] for item in new_item_list)
-            
-            if new_total_count > old_total_count:
+            if item_name in net_added:
                 # 数量增加
                 added.append({
                     'name': item_name,
-                    'count': new_total_count - old_total_count,
+                    'count': net_added[item_name],
                     'slot': 'multiple'  # 多个槽位
                 })
-            elif new_total_count < old_total_count:
+            elif item_name in net_removed:
                 # 数量减少
                 removed.append({
                     'name': item_name,
-                    'count': old_total_count - new_total_count,
+                    'count': net_removed[item_name],
                     'slot': 'multiple'  # 多个槽位
                 })
             
             # 检查具体槽位的变化
-            for new_item in new_item_list:
-                new_slot = new_item['slot']
-                new_count = new_item['count']
-                
-                # 查找相同槽位的旧物品
-                old_item_in_slot = None
-                for old_item in old_item_list:
-                    if old_item['slot'] == new_slot:
-                        old_item_in_slot = old_item
-                        break
-                
-                if old_item_in_slot is None:
+            for slot, new_count in new_slots.items():
+                if slot not in old_slots:
                     # 这个槽位新增了物品
-                    added.append(new_item.copy())
-                elif old_item_in_slot['count'] != new_count:
+                    added.append({'name': item_name, 'count': new_count, 'slot': slot})
+                elif old_slots[slot] != new_count:
                     # 这个槽位的物品数量发生了变化
                     changed.append({
                         'name': item_name,
-                        'old_count': old_item_in_slot['count'],
+                        'old_count': old_slots[slot],
                         'new_count': new_count,
-                        'slot': new_slot
+                        'slot': slot
                     })
     
     # 检查移除的物品
-    for item_name, old_item_list in old_items.items():
-        if item_name not in new_items:
-            # 完全移除的物品
-            for old_item in old_item_list:
-                removed.append(old_item.copy())
-        else:
-            # 检查具体槽位的移除
-            new_item_list = new_items[item_name]
-            for old_item in old_item_list:
-                old_slot = old_item['slot']
-                
-                # 查找相同槽位的新物品
-                new_item_in_slot = None
-                for new_item in new_item_list:
-                    if new_item['slot'] == old_slot:
-                        new_item_in_slot = new_item
-                        break
-                
-                if new_item_in_slot is None:
-                    # 这个槽位的物品被移除了
-                    removed.append(old_item.copy())
+    for item_name, old_slots in old_items.items():
+        new_slots = new_items.get(item_name)
+        for slot, count in old_slots.items():
+            # 完全移除的物品，或这个槽位的物品被移除了
+            if new_slots is None or slot not in new_slots:
+                removed.append({'name': item_name, 'count': count, 'slot': slot})
     
     # 生成摘要文本
     summary_parts = []
@@ -456,6 +429,62 @@ def compare_inventories(old_inventory: List[Dict[str, Any]], new_inventory: List
     }
 
 
+def _compare_inventories_text(old_inventory: List[Dict[str, Any]], new_inventory: List[Dict[str, Any]]) -> str:
+    """
+    比较差异的同时直接生成差异文本，不构建中间的 added/removed/changed 结构
+    """
+    old_items, old_totals = _index_inventory(old_inventory)
+    new_items, new_totals = _index_inventory(new_inventory)
+    net_added = new_totals - old_totals
+    net_removed = old_totals - new_totals
+    
+    added_lines = []
+    removed_lines = []
+    changed_lines = []
+    
+    # 检查新增和数量变化的物品
+    for item_name, new_slots in new_items.items():
+        old_slots = old_items.get(item_name)
+        if old_slots is None:
+            # 完全新增的物品
+            for slot, count in new_slots.items():
+                added_lines.append(f"  + {item_name} x{count} (槽位{slot})")
+            continue
+        
+        if item_name in net_added:
+            added_lines.append(f"  + {item_name} x{net_added[item_name]}")
+        elif item_name in net_removed:
+            removed_lines.append(f"  - {item_name} x{net_removed[item_name]}")
+        
+        # 检查具体槽位的变化
+        for slot, count in new_slots.items():
+            if slot not in old_slots:
+                added_lines.append(f"  + {item_name} x{count} (槽位{slot})")
+            elif old_slots[slot] != count:
+                changed_lines.append(f"  {item_name}: {old_slots[slot]} → {count} (槽位{slot})")
+    
+    # 检查移除的物品
+    for item_name, old_slots in old_items.items():
+        new_slots = new_items.get(item_name)
+        for slot, count in old_slots.items():
+            if new_slots is None or slot not in new_slots:
+                removed_lines.append(f"  - {item_name} x{count} (槽位{slot})")
+    
+    lines = ["【物品栏变化】"]
+    if added_lines:
+        lines.append("新增物品:")
+        lines.extend(added_lines)
+    if removed_lines:
+        lines.append("减少物品:")
+        lines.extend(removed_lines)
+    if changed_lines:
+        lines.append("数量变化:")
+        lines.extend(changed_lines)
+    if len(lines) == 1:
+        lines.append("物品栏没有变化")
+    return "\n".join(lines)
+
+
 def get_inventory_diff_text(old_inventory: List[Dict[str, Any]], new_inventory: List[Dict[str, Any]]) -> str:
     """
     获取两个inventory差异的可读文本
@@ -467,28 +496,4 @@ def get_inventory_diff_text(old_inventory: List[Dict[str, Any]], new_inventory:
     Returns:
         格式化的差异文本
     """
-    diff = compare_inventories(old_inventory, new_inventory)
-    
-    lines = ["【物品栏变化】"]
-    
-    if diff['added']:
-        lines.append("新增物品:")
-        for item in diff['added']:
-            slot_info = f" (槽位{item['slot']})" if item['slot'] != 'multiple' else ""
-            lines.append(f"  + {item['name']} x{item['count']}{slot_info}")
-    
-    if diff['removed']:
-        lines.append("减少物品:")
-        for item in diff['removed']:
-            slot_info = f" (槽位{item['slot']})" if item['slot'] != 'multiple' else ""
-            lines.append(f"  - {item['name']} x{item['count']}{slot_info}")
-    
-    if diff['changed']:
-        lines.append("数量变化:")
-        for item in diff['changed']:
-            lines.append(f"  {item['name']}: {item['old_count']} → {item['new_count']} (槽位{item['slot']})")
-    
-    if not any([diff['added'], diff['removed'], diff['changed']]):
-        lines.append("物品栏没有变化")
-    
-    return "\n".join(lines)
\ No newline at end of file
+    return _compare_inventories_text(old_inventory, new_inventory)
\ No newline at end of file
@@ -33,7 +33,7 @@ async def get_containers(
                 "data":None
             }
 
-        center_block_pos = BlockPosition(center_position)
+        center_block_pos = BlockPosition.from_position(center_position)
 
         # 获取附近的容器
         containers = global_container_cache.get_nearby_containers_with_verify(
@@ -181,13 +181,14 @@ async def clean_invalid_containers():
 async def get_container_stats():
     """获取容器统计信息"""
     try:
-        chest_count = len(global_container_cache.chest_cache)
-        furnace_count = len(global_container_cache.furnace_cache)
-        total_count = chest_count + furnace_count
+        all_containers = list(global_container_cache.container_cache.values())
+        chest_count = sum(1 for c in all_containers if c.container_type == "chest")
+        total_count = len(all_containers)
+        furnace_count = total_count - chest_count
 
         # 计算总物品数量
         total_items = 0
-        for container in list(global_container_cache.chest_cache.values()) + list(global_container_cache.furnace_cache.values()):
+        for container in all_containers:
             if container.inventory:
                 total_items += sum(container.inventory.values())
             if container.furnace_slots:
@@ -1,14 +1,20 @@
 import os
 import base64
 import mimetypes
-from io import BytesIO
 from typing import List, Dict, Any, Optional, Union
 from openai import AsyncOpenAI
-from PIL import Image
 from utils.logger import get_logger
 from openai_client.modelconfig import ModelConfig
 from openai_client.token_usage_manager import TokenUsageManager
 
+# 图片文件头 -> MIME 类型（只读取前几个字节判断格式，无需复制和解析整张图片）
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
         
 class LLMClient:
     """LLM调用客户端"""
@@ -35,23 +41,19 @@ class LLMClient:
     
     def _infer_mime_from_bytes(self, data: bytes) -> str:
         """根据图片字节推断 MIME 类型，默认 image/png"""
-        try:
-            with Image.open(BytesIO(data)) as img:
-                format_to_mime = {
-                    "PNG": "image/png",
-                    "JPEG": "image/jpeg",
-                    "JPG": "image/jpeg",
-                    "WEBP": "image/webp",
-                    "GIF": "image/gif",
-                }
-                return format_to_mime.get(img.format, "image/png")
-        except Exception:
-            return "image/png"
+        header = bytes(data[:12])
+        for signature, mime in IMAGE_SIGNATURES:
+            if header.startswith(signature):
+                return mime
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            return "image/webp"
+        return "image/png"
 
     def _path_or_url_to_data_url(self, image: Union[str, bytes]) -> str:
         """将 URL/本地路径/字节 转为 URL 或 data URL"""
         if isinstance(image, str):
-            if image.startswith("http://") or image.startswith("https://"):
+            # 已是 data URL（如截图）或网络地址时原样返回，不再对整段字符串做文件路径检查
+            if image.startswith(("data:", "http://", "https://")):
                 return image
             if os.path.exists(image) and os.path.isfile(image):
                 with open(image, "rb") as f:
@@ -62,13 +64,13 @@ class LLMClient:
                 b64 = base64.b64encode(data).decode("ascii")
                 return f"data:{mime};base64,{b64}"
             return image
-        elif isinstance(image, (bytes, bytearray)):
-            data = bytes(image)
-            mime = self._infer_mime_from_bytes(data)
-            b64 = base64.b64encode(data).decode("ascii")
+        elif isinstance(image, (bytes, bytearray, memoryview)):
+            # 直接对原缓冲区编码，不先复制为 bytes
+            mime = self._infer_mime_from_bytes(image)
+            b64 = base64.b64encode(image).decode("ascii")
             return f"data:{mime};base64,{b64}"
         else:
-            raise TypeError("image 参数必须为 str(路径或URL) 或 bytes")
+            raise TypeError("image 参数必须为 str(路径或URL) 或 bytes/memoryview")
 
     def _build_vision_user_content(self, prompt: str, images: Union[str, bytes, List[Union[str, bytes]]]) -> List[Dict[str, Any]]:
         """构建多模态 user content 列表，兼容 OpenAI Chat Completions 识图格式"""